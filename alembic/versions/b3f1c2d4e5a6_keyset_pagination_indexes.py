@@ -0,0 +1,28 @@
+"""keyset pagination indexes
+
+Revision ID: b3f1c2d4e5a6
+Revises: 92b73061a49f
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, None] = '92b73061a49f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_companies_owner_id_id', 'companies', ['owner_id', 'id'], unique=False)
+    op.create_index('ix_company_members_company_id_id', 'company_members', ['company_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_members_company_id_id', table_name='company_members')
+    op.drop_index('ix_companies_owner_id_id', table_name='companies')
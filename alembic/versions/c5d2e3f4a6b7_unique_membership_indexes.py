@@ -0,0 +1,56 @@
+"""unique membership indexes
+
+Revision ID: c5d2e3f4a6b7
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e3f4a6b7'
+down_revision: Union[str, None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'pending'")
+
+
+def upgrade() -> None:
+    # Прибираємо дублікати, які могли з'явитись до обмежень: лишаємо найстаріший рядок
+    op.execute(
+        "DELETE FROM company_members WHERE id NOT IN ("
+        "SELECT MIN(id) FROM company_members GROUP BY company_id, user_id)"
+    )
+    op.execute(
+        "UPDATE company_invitations SET status = 'cancelled' "
+        "WHERE status = 'pending' AND id NOT IN ("
+        "SELECT MIN(id) FROM company_invitations WHERE status = 'pending' "
+        "GROUP BY company_id, invited_user_id)"
+    )
+    op.execute(
+        "UPDATE company_membership_requests SET status = 'cancelled' "
+        "WHERE status = 'pending' AND id NOT IN ("
+        "SELECT MIN(id) FROM company_membership_requests WHERE status = 'pending' "
+        "GROUP BY company_id, user_id)"
+    )
+
+    op.create_index('uq_company_members_company_id_user_id', 'company_members', ['company_id', 'user_id'], unique=True)
+    op.create_index(
+        'uq_company_invitations_pending', 'company_invitations', ['company_id', 'invited_user_id'],
+        unique=True, postgresql_where=PENDING, sqlite_where=PENDING,
+    )
+    op.create_index(
+        'uq_company_membership_requests_pending', 'company_membership_requests', ['company_id', 'user_id'],
+        unique=True, postgresql_where=PENDING, sqlite_where=PENDING,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_company_membership_requests_pending', table_name='company_membership_requests')
+    op.drop_index('uq_company_invitations_pending', table_name='company_invitations')
+    op.drop_index('uq_company_members_company_id_user_id', table_name='company_members')
@@ -0,0 +1,35 @@
+"""hot filter indexes
+
+Revision ID: d6e4f5a7b8c9
+Revises: c5d2e3f4a6b7
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e4f5a7b8c9'
+down_revision: Union[str, None] = 'c5d2e3f4a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # companies(owner_id, id) вже створено в b3f1c2d4e5a6
+    op.create_index('ix_company_invitations_company_id_status', 'company_invitations', ['company_id', 'status'], unique=False)
+    op.create_index('ix_company_invitations_invited_user_id_status_created_at', 'company_invitations', ['invited_user_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_company_membership_requests_company_id_status', 'company_membership_requests', ['company_id', 'status'], unique=False)
+    op.create_index('ix_company_membership_requests_user_id_status_created_at', 'company_membership_requests', ['user_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_company_members_user_id_company_id', 'company_members', ['user_id', 'company_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_members_user_id_company_id', table_name='company_members')
+    op.drop_index('ix_company_membership_requests_user_id_status_created_at', table_name='company_membership_requests')
+    op.drop_index('ix_company_membership_requests_company_id_status', table_name='company_membership_requests')
+    op.drop_index('ix_company_invitations_invited_user_id_status_created_at', table_name='company_invitations')
+    op.drop_index('ix_company_invitations_company_id_status', table_name='company_invitations')
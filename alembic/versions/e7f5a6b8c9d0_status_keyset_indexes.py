@@ -0,0 +1,41 @@
+"""status keyset indexes
+
+Revision ID: e7f5a6b8c9d0
+Revises: d6e4f5a7b8c9
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f5a6b8c9d0'
+down_revision: Union[str, None] = 'd6e4f5a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Списки гортаються за id, тож id іде в індекс одразу після статусу
+    op.create_index('ix_company_invitations_company_id_status_id', 'company_invitations', ['company_id', 'status', 'id'], unique=False)
+    op.create_index('ix_company_invitations_invited_user_id_status_id', 'company_invitations', ['invited_user_id', 'status', 'id'], unique=False)
+    op.create_index('ix_company_membership_requests_company_id_status_id', 'company_membership_requests', ['company_id', 'status', 'id'], unique=False)
+    op.create_index('ix_company_membership_requests_user_id_status_id', 'company_membership_requests', ['user_id', 'status', 'id'], unique=False)
+    op.drop_index('ix_company_membership_requests_user_id_status_created_at', table_name='company_membership_requests')
+    op.drop_index('ix_company_membership_requests_company_id_status', table_name='company_membership_requests')
+    op.drop_index('ix_company_invitations_invited_user_id_status_created_at', table_name='company_invitations')
+    op.drop_index('ix_company_invitations_company_id_status', table_name='company_invitations')
+
+
+def downgrade() -> None:
+    op.create_index('ix_company_invitations_company_id_status', 'company_invitations', ['company_id', 'status'], unique=False)
+    op.create_index('ix_company_invitations_invited_user_id_status_created_at', 'company_invitations', ['invited_user_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_company_membership_requests_company_id_status', 'company_membership_requests', ['company_id', 'status'], unique=False)
+    op.create_index('ix_company_membership_requests_user_id_status_created_at', 'company_membership_requests', ['user_id', 'status', 'created_at'], unique=False)
+    op.drop_index('ix_company_membership_requests_user_id_status_id', table_name='company_membership_requests')
+    op.drop_index('ix_company_membership_requests_company_id_status_id', table_name='company_membership_requests')
+    op.drop_index('ix_company_invitations_invited_user_id_status_id', table_name='company_invitations')
+    op.drop_index('ix_company_invitations_company_id_status_id', table_name='company_invitations')
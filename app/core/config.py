@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import Optional
+from typing import Literal, Optional
 
 
 class AppSettings(BaseSettings):
@@ -18,6 +18,19 @@ class DatabaseSettings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_HOST: str
     DB_PORT: int
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT: float = Field(default=30.0)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    # Репліки для читання: "host" або "host:port", решта параметрів як у основної БД
+    DB_REPLICA_HOSTS: list[str] = Field(default=[])
+    DB_REPLICA_RETRY_INTERVAL: float = Field(default=30.0)
+    DB_REPLICA_CONNECT_TIMEOUT: float = Field(default=2.0)
+    DB_READ_YOUR_WRITES_WINDOW: int = Field(default=5)
+    SQL_LOG_MODE: Literal["off", "slow", "sampled", "all"] = Field(default="slow")
+    SQL_LOG_SAMPLE_RATE: float = Field(default=0.01)
+    SQL_SLOW_QUERY_MS: float = Field(default=200.0)
 
     @property
     def DATABASE_URL(self) -> str:
@@ -27,6 +40,18 @@ class DatabaseSettings(BaseSettings):
             f"{self.DB_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def REPLICA_URLS(self) -> list[str]:
+        urls = []
+        for replica in self.DB_REPLICA_HOSTS:
+            host, _, port = replica.partition(":")
+            urls.append(
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:"
+                f"{self.POSTGRES_PASSWORD}@{host}:"
+                f"{port or self.DB_PORT}/{self.POSTGRES_DB}"
+            )
+        return urls
+
     @property
     def DATABASE_URL_SYNC(self) -> str:
         return (
@@ -50,12 +75,53 @@ class RedisSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
 
+class CacheSettings(BaseSettings):
+    CACHE_ENABLED: bool = Field(default=True)
+    COUNT_CACHE_TTL: int = Field(default=60)
+    APPROXIMATE_COUNT_THRESHOLD: int = Field(default=100_000)
+    USER_CACHE_TTL: int = Field(default=300)
+    COMPANY_CACHE_TTL: int = Field(default=300)
+    PRINCIPAL_CACHE_TTL: int = Field(default=60)
+    AUTH0_CLAIMS_CACHE_TTL: int = Field(default=3600)
+    LOCAL_CACHE_MAX_SIZE: int = Field(default=1024)
+    LOCAL_CACHE_TTL: int = Field(default=30)
+    CACHE_INVALIDATION_CHANNEL: str = Field(default="cache:invalidate")
+    SINGLE_FLIGHT_LOCK_TTL: float = Field(default=5.0)
+    SINGLE_FLIGHT_POLL_INTERVAL: float = Field(default=0.05)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class PaginationSettings(BaseSettings):
+    MAX_PAGE_SIZE: int = Field(default=100)
+    STREAM_CHUNK_SIZE: int = Field(default=500)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class BulkSettings(BaseSettings):
+    BULK_MAX_ITEMS: int = Field(default=1000)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
 class Auth0Settings(BaseSettings):
     AUTH0_DOMAIN: str
     AUTH0_CLIENT_ID: str
     AUTH0_CLIENT_SECRET: str
     AUTH0_AUDIENCE: str = ""
     AUTH0_REDIRECT_URI: str = "http://localhost:8000/auth0/token"
+    AUTH0_HTTP_TIMEOUT: float = Field(default=5.0)
+    AUTH0_HTTP_MAX_CONNECTIONS: int = Field(default=20)
+    AUTH0_HTTP_MAX_KEEPALIVE: int = Field(default=10)
+    AUTH0_HTTP_RETRIES: int = Field(default=2)
+    AUTH0_HTTP_BACKOFF: float = Field(default=0.2)
+    AUTH0_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+    AUTH0_CIRCUIT_RESET_TIMEOUT: float = Field(default=30.0)
+    AUTH0_JWKS_TTL: int = Field(default=3600)
+    AUTH0_JWKS_MIN_REFRESH_INTERVAL: int = Field(default=30)
+    AUTH0_CLAIMS_FROM_TOKEN: bool = Field(default=False)
+    AUTH0_CLIENT_TOKEN_REFRESH_MARGIN: int = Field(default=300)
 
     @property
     def AUTH0_AUTHORIZATION_ENDPOINT(self) -> str:
@@ -76,6 +142,42 @@ class SecuritySettings(BaseSettings):
     JWT_SECRET_KEY: str = Field(..., json_schema_extra={"env": "JWT_SECRET_KEY"})
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    PASSWORD_HASH_MAX_PENDING: int = Field(default=64)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class LoggingSettings(BaseSettings):
+    LOG_LEVEL: str = Field(default="INFO")
+    LOG_FORMAT: str = Field(default="json")
+    LOG_LEVELS: dict[str, str] = Field(default={})
+    LOG_QUEUE_SIZE: int = Field(default=10_000)
+    LOG_HOT_LOGGERS: list[str] = Field(
+        default=["app.services.company_actions", "app.routers.company_actions"]
+    )
+    LOG_HOT_INFO_PER_SECOND: float = Field(default=20.0)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class RequestLogSettings(BaseSettings):
+    REQUEST_LOG_SAMPLE_RATE: float = Field(default=1.0)
+    REQUEST_LOG_SLOW_MS: float = Field(default=1000.0)
+    REQUEST_LOG_EXCLUDE_PATHS: list[str] = Field(default=["/", "/metrics"])
+    SERVER_TIMING_ENABLED: bool = Field(default=True)
+
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+
+class JobQueueSettings(BaseSettings):
+    JOB_QUEUE_NAME: str = Field(default="default")
+    JOB_QUEUE_CONSUMERS: int = Field(default=2)
+    JOB_MAX_ATTEMPTS: int = Field(default=5)
+    JOB_RETRY_BACKOFF: float = Field(default=1.0)
+    JOB_DRAIN_TIMEOUT: float = Field(default=10.0)
+    JOB_HEARTBEAT_TTL: int = Field(default=30)
+    JOB_POLL_TIMEOUT: int = Field(default=1)
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -83,5 +185,11 @@ class SecuritySettings(BaseSettings):
 app_settings = AppSettings()
 db_settings = DatabaseSettings()
 redis_settings = RedisSettings()
+cache_settings = CacheSettings()
+pagination_settings = PaginationSettings()
+bulk_settings = BulkSettings()
 auth0_settings = Auth0Settings()
 security_settings = SecuritySettings()
+job_queue_settings = JobQueueSettings()
+logging_settings = LoggingSettings()
+request_log_settings = RequestLogSettings()
@@ -1,9 +1,138 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
+from app.core.config import logging_settings
+
+
+class JsonFormatter(logging.Formatter):
+    """Один JSON-об'єкт на рядок: час, рівень, логер, повідомлення і traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class HotPathRateLimit:
+    """Token bucket на кожен гарячий логер: не більше per_second INFO-записів.
+
+    WARNING і вище проходять завжди; кількість відкинутих записів додається
+    до першого запису, що пройде після паузи.
+    """
+
+    def __init__(self, prefixes, per_second: float):
+        self.prefixes = tuple(prefixes)
+        self.per_second = per_second
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, record: logging.LogRecord) -> Optional[int]:
+        """None — запис відкинуто, інакше скільки записів відкинуто перед ним."""
+        if record.levelno > logging.INFO or not record.name.startswith(self.prefixes):
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            # [токени, час останнього поповнення, відкинуто]
+            bucket = self._buckets.setdefault(record.name, [self.per_second, now, 0])
+            bucket[0] = min(self.per_second, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return None
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        return suppressed
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Кладе запис у чергу без очікування; при переповненні запис відкидається.
+
+    Тут лише підставляються аргументи повідомлення, а JSON-форматування
+    і запис у потік виконує QueueListener в окремому потоці.
+    """
+
+    def __init__(self, log_queue: queue.Queue, rate_limit: Optional[HotPathRateLimit] = None):
+        super().__init__(log_queue)
+        self.rate_limit = rate_limit
+        self.dropped = 0
+        self.rate_limited = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        suppressed = 0
+        if self.rate_limit is not None:
+            suppressed = self.rate_limit.admit(record)
+            if suppressed is None:
+                self.rate_limited += 1
+                return
+        try:
+            prepared = self.prepare(record)
+            if suppressed:
+                # Суфікс лише на копії, інші обробники бачать запис без змін
+                prepared.msg = prepared.message = f"{prepared.message} (+{suppressed} suppressed)"
+            self.enqueue(prepared)
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Аргументи підставляємо одразу: до обробки в потоці вони можуть змінитися
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> tuple[NonBlockingQueueHandler, QueueListener]:
+    stream_handler = logging.StreamHandler()
+    if logging_settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+        )
+
+    queue_handler = NonBlockingQueueHandler(
+        queue.Queue(logging_settings.LOG_QUEUE_SIZE),
+        HotPathRateLimit(logging_settings.LOG_HOT_LOGGERS, logging_settings.LOG_HOT_INFO_PER_SECOND),
+    )
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(logging_settings.LOG_LEVEL)
+    for name, level in logging_settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    # Дописуємо залишок черги перед виходом процесу
+    atexit.register(listener.stop)
+    return queue_handler, listener
+
+
+log_queue_handler, log_listener = configure_logging()
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,99 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+from app.core.logger import logger
+
+# ASGI scope поточного запиту; маршрут у нього дописує роутер після зіставлення
+current_request: ContextVar[Optional[dict]] = ContextVar("current_request", default=None)
+
+
+def route_of(scope: dict) -> str:
+    # Шаблон маршруту замість сирого шляху, щоб не плодити унікальні рядки
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope["path"]
+
+
+def current_route() -> Optional[str]:
+    scope = current_request.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {route_of(scope)}"
+
+
+class RequestLoggingMiddleware:
+    """Чистий ASGI middleware: логує метод, шаблон маршруту, статус і тривалість.
+
+    Не створює додаткових задач і не буферизує тіло, тож streaming-відповіді
+    проходять як є. Звичайні запити логуються з ймовірністю sample_rate,
+    повільні й 5xx — завжди; шляхи з exclude_paths не логуються взагалі.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = 1.0,
+        slow_ms: float = 1000.0,
+        exclude_paths: Iterable[str] = (),
+        server_timing: bool = True,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.exclude_paths = frozenset(exclude_paths)
+        # "/metrics" виключає і "/metrics/...", а "/" — лише сам корінь
+        self.exclude_prefixes = tuple(
+            path.rstrip("/") + "/" for path in self.exclude_paths if path != "/"
+        )
+        self.server_timing = server_timing
+
+    def _excluded(self, path: str) -> bool:
+        return path in self.exclude_paths or path.startswith(self.exclude_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_request.set(scope)
+        try:
+            if self._excluded(scope["path"]):
+                await self.app(scope, receive, send)
+            else:
+                await self._handle(scope, receive, send)
+        finally:
+            current_request.reset(token)
+
+    async def _handle(self, scope, receive, send):
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Час до заголовків відповіді, тіло може ще стрімитись
+                    duration = (time.perf_counter() - start) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", b"app;dur=%.2f" % duration))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if status >= 500:
+                self._log(logging.ERROR, scope, status, duration)
+            elif duration >= self.slow_ms:
+                self._log(logging.WARNING, scope, status, duration)
+            elif self.sample_rate >= 1 or random.random() < self.sample_rate:
+                self._log(logging.INFO, scope, status, duration)
+
+    @staticmethod
+    def _log(level: int, scope, status: int, duration: float) -> None:
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, "%s %s %s %.2fms", scope["method"], route_of(scope), status, duration)
@@ -1,15 +1,83 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import db_settings
 from sqlalchemy.orm import declarative_base
+from app.db.pool import TimedQueuePool
+from app.db.query_log import install_query_logging
+from app.db.replicas import ReadYourWrites, ReplicaSet
 
 DATABASE_URL = db_settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+def create_engine_for(url: str, **engine_options) -> AsyncEngine:
+    # Загальна кількість з'єднань до Postgres: воркери uvicorn × (pool_size + max_overflow)
+    new_engine = create_async_engine(
+        url,
+        **engine_options,
+        poolclass=TimedQueuePool,
+        pool_size=db_settings.DB_POOL_SIZE,
+        max_overflow=db_settings.DB_MAX_OVERFLOW,
+        pool_timeout=db_settings.DB_POOL_TIMEOUT,
+        pool_recycle=db_settings.DB_POOL_RECYCLE,
+        pool_pre_ping=db_settings.DB_POOL_PRE_PING,
+    )
+    install_query_logging(
+        new_engine.sync_engine,
+        mode=db_settings.SQL_LOG_MODE,
+        sample_rate=db_settings.SQL_LOG_SAMPLE_RATE,
+        slow_ms=db_settings.SQL_SLOW_QUERY_MS,
+    )
+    return new_engine
+
+
+class WriteTrackingSession(Session):
+    """Сесія основної БД, що позначає в info, чи виконувались у ній записи."""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+engine = create_engine_for(DATABASE_URL)
+AsyncSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, sync_session_class=WriteTrackingSession, expire_on_commit=False
+)
+replica_set = ReplicaSet(
+    [
+        create_engine_for(url, connect_args={"timeout": db_settings.DB_REPLICA_CONNECT_TIMEOUT})
+        for url in db_settings.REPLICA_URLS
+    ],
+    retry_interval=db_settings.DB_REPLICA_RETRY_INTERVAL,
+    connect_timeout=db_settings.DB_REPLICA_CONNECT_TIMEOUT,
+)
+read_your_writes = ReadYourWrites(db_settings.DB_READ_YOUR_WRITES_WINDOW)
 Base = declarative_base()
 
 
-async def get_db():
+async def get_db(request: Request):
     async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            if replica_set.engines and session.info.get("wrote"):
+                await read_your_writes.mark(request)
+
+
+async def get_read_db(request: Request):
+    # Лише для ендпоінтів, що тільки читають; без реплік це звичайна сесія основної БД
+    session = None
+    if replica_set.engines and not await read_your_writes.is_sticky(request):
+        session = await replica_set.open_session()
+    if session is None:
+        session = AsyncSessionLocal()
+    async with session:
         yield session
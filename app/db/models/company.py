@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 import enum
@@ -10,6 +10,8 @@ class VisibilityEnum(enum.Enum):
 
 class Company(Base):
     __tablename__ = "companies"
+    # Keyset-пагінація власних компаній: WHERE owner_id = ? AND id > ? ORDER BY id
+    __table_args__ = (Index("ix_companies_owner_id_id", "owner_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
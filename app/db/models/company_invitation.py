@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, timezone
@@ -12,6 +12,16 @@ class InvitationStatus(enum.Enum):
 
 class CompanyInvitation(Base):
     __tablename__ = "company_invitations"
+    # Не більше одного активного запрошення на пару компанія–користувач
+    __table_args__ = (
+        Index(
+            "uq_company_invitations_pending", "company_id", "invited_user_id", unique=True,
+            postgresql_where=text("status = 'pending'"), sqlite_where=text("status = 'pending'"),
+        ),
+        # Keyset-сторінки списків компанії та користувача з фільтром за статусом
+        Index("ix_company_invitations_company_id_status_id", "company_id", "status", "id"),
+        Index("ix_company_invitations_invited_user_id_status_id", "invited_user_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, timezone
 
 class CompanyMember(Base):
     __tablename__ = "company_members"
+    __table_args__ = (
+        # Keyset-пагінація учасників: WHERE company_id = ? AND id > ? ORDER BY id
+        Index("ix_company_members_company_id_id", "company_id", "id"),
+        Index("uq_company_members_company_id_user_id", "company_id", "user_id", unique=True),
+        # Компанії, де користувач є учасником
+        Index("ix_company_members_user_id_company_id", "user_id", "company_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, timezone
@@ -12,6 +12,16 @@ class MembershipRequestStatus(enum.Enum):
 
 class CompanyMembershipRequest(Base):
     __tablename__ = "company_membership_requests"
+    # Не більше одного активного запиту на пару компанія–користувач
+    __table_args__ = (
+        Index(
+            "uq_company_membership_requests_pending", "company_id", "user_id", unique=True,
+            postgresql_where=text("status = 'pending'"), sqlite_where=text("status = 'pending'"),
+        ),
+        # Keyset-сторінки списків компанії та користувача з фільтром за статусом
+        Index("ix_company_membership_requests_company_id_status_id", "company_id", "status", "id"),
+        Index("ix_company_membership_requests_user_id_status_id", "user_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     # Додаємо ondelete="CASCADE" для зовнішнього ключа company_id
@@ -0,0 +1,50 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, що рахує очікування на вільне з'єднання і тайм-аути."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_metrics = {"checkouts": 0, "timeouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_metrics["timeouts"] += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - start) * 1000
+            self.wait_metrics["wait_ms_total"] += waited
+            self.wait_metrics["wait_ms_max"] = max(self.wait_metrics["wait_ms_max"], waited)
+        self.wait_metrics["checkouts"] += 1
+        return connection
+
+    def recreate(self):
+        # Після dispose пул створюється заново, лічильники переносимо
+        pool = super().recreate()
+        pool.wait_metrics = self.wait_metrics
+        return pool
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool рахує overflow від -pool_size; показуємо лише понад pool_size
+        "overflow": max(pool.overflow(), 0),
+    }
+    metrics = getattr(pool, "wait_metrics", None)
+    if metrics is not None:
+        checkouts = metrics["checkouts"]
+        stats.update(metrics)
+        stats["wait_ms_avg"] = metrics["wait_ms_total"] / checkouts if checkouts else 0.0
+    return stats
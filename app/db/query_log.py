@@ -0,0 +1,47 @@
+import logging
+import random
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.middleware import current_route
+
+logger = logging.getLogger(__name__)
+
+# Останні повільні запити для /metrics/slow-queries
+slow_queries: deque = deque(maxlen=50)
+
+
+def install_query_logging(engine: Engine, mode: str, sample_rate: float, slow_ms: float) -> None:
+    """Замість echo=True: логування SQL за режимом з налаштувань.
+
+    off — обробники подій не ставляться зовсім; slow — лише запити, довші за
+    slow_ms; sampled — ще й частка sample_rate решти запитів; all — усі.
+    Повільні запити логуються з маршрутом, що їх виконав, і зберігаються
+    в slow_queries. Параметри запитів не логуються.
+    """
+    if mode == "off":
+        return
+
+    # Час старту тримаємо в контексті виконання: якщо запит впаде,
+    # after_cursor_execute не викличеться і на з'єднанні нічого не лишиться
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = (time.perf_counter() - context._query_start_time) * 1000
+        if duration >= slow_ms:
+            route = current_route()
+            slow_queries.append({
+                "statement": statement,
+                "duration_ms": round(duration, 2),
+                "route": route,
+                "at": time.time(),
+            })
+            logger.warning("Slow query %.2fms from %s: %s", duration, route, statement)
+        elif mode == "all" or (mode == "sampled" and random.random() < sample_rate):
+            logger.info("Query %.2fms: %s", duration, statement)
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import itertools
+import time
+from typing import Optional
+
+from fastapi import Request
+from redis.exceptions import RedisError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.logger import logger
+from app.db.pool import pool_stats
+from app.db.redis import redis_client
+
+
+class ReplicaSet:
+    """Round-robin по репліках для читання.
+
+    Перед видачею сесії з'єднання відкривається одразу: якщо репліка не
+    відповідає за connect_timeout, вона пропускається retry_interval секунд, а запит іде до
+    наступної репліки або, якщо живих не лишилось, до основної БД.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], retry_interval: float, connect_timeout: float):
+        self.engines = engines
+        self.retry_interval = retry_interval
+        self.connect_timeout = connect_timeout
+        self._sessionmakers = [
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in engines
+        ]
+        self._down_until = [0.0] * len(engines)
+        self._counter = itertools.count()
+
+    def is_down(self, index: int) -> bool:
+        return time.monotonic() < self._down_until[index]
+
+    def stats(self) -> list[dict]:
+        return [
+            {"down": self.is_down(index), **pool_stats(engine)}
+            for index, engine in enumerate(self.engines)
+        ]
+
+    async def open_session(self) -> Optional[AsyncSession]:
+        if not self.engines:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self.is_down(index):
+                continue
+            session = self._sessionmakers[index]()
+            # Щоб сервіси не кешували в Redis дані з репліки, що відстає
+            session.info["replica"] = True
+            try:
+                # Недосяжна репліка не повинна тримати запит до тайм-ауту драйвера,
+                # у тому числі на pre-ping уже відкритого з'єднання
+                await asyncio.wait_for(session.connection(), self.connect_timeout)
+            except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                await session.close()
+                self._down_until[index] = time.monotonic() + self.retry_interval
+                logger.warning("Read replica %s is unavailable: %s", index, e)
+                continue
+            return session
+        return None
+
+
+class ReadYourWrites:
+    """Після запису клієнт window секунд читає з основної БД.
+
+    Клієнт визначається за заголовком Authorization; позначка зберігається
+    в пам'яті воркера і в Redis, щоб її бачили інші воркери.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._local: dict[str, float] = {}
+
+    @staticmethod
+    def client_key(request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode()).hexdigest()
+
+    @staticmethod
+    def redis_key(client_key: str) -> str:
+        return f"db:recent_write:{client_key}"
+
+    async def mark(self, request: Request) -> None:
+        client_key = self.client_key(request)
+        if client_key is None:
+            return
+        now = time.monotonic()
+        if len(self._local) > 10_000:
+            self._local = {k: v for k, v in self._local.items() if v > now}
+        self._local[client_key] = now + self.window
+        try:
+            await redis_client.set(self.redis_key(client_key), "1", ex=self.window)
+        except RedisError as e:
+            logger.warning("Failed to mark recent write: %s", e)
+
+    async def is_sticky(self, request: Request) -> bool:
+        client_key = self.client_key(request)
+        if client_key is None:
+            return False
+        if self._local.get(client_key, 0.0) > time.monotonic():
+            return True
+        try:
+            return await redis_client.get(self.redis_key(client_key)) is not None
+        except RedisError as e:
+            # Не знаємо, чи був запис, тож читаємо з основної БД
+            logger.warning("Failed to check recent write: %s", e)
+            return True
@@ -1,27 +1,45 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
 from app.routers.database import postgres, redis
-from app.routers import health, user, auth0, auth, company, company_actions, owned_companies
+from app.routers import health, user, auth0, auth, company, company_actions, owned_companies, metrics
 from app.core.logger import logger
+from app.core.config import cache_settings, request_log_settings
+from app.core.middleware import RequestLoggingMiddleware
+from app.services.cache import listen_for_invalidations
+from app.services.password_hasher import password_hasher
+from app.services.jwks import jwks_manager
+from app.services.http_client import auth0_client
+from app.services.job_queue import job_queue
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Backend API is starting...")
+    invalidation_listener = None
+    if cache_settings.CACHE_ENABLED:
+        invalidation_listener = asyncio.create_task(listen_for_invalidations())
+    await auth0_client.start()
+    await job_queue.start()
+    # Ключі Auth0 завантажуються у фоні, старт не чекає на мережу
+    jwks_refresher = asyncio.create_task(jwks_manager.run_refresh_loop())
     yield
     logger.info("Backend API is shutting down...")
+    # Спершу дочікуємось фонових задач, поки клієнти й пули ще відкриті
+    await job_queue.stop()
+    jwks_refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await jwks_refresher
+    if invalidation_listener is not None:
+        invalidation_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await invalidation_listener
+    await auth0_client.close()
+    await password_hasher.shutdown()
 
 app = FastAPI(title="Backend API", lifespan=lifespan)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info(f"Incoming request: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Response status: {response.status_code}")
-        return response
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -29,7 +47,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(LoggingMiddleware)
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=request_log_settings.REQUEST_LOG_SAMPLE_RATE,
+    slow_ms=request_log_settings.REQUEST_LOG_SLOW_MS,
+    exclude_paths=request_log_settings.REQUEST_LOG_EXCLUDE_PATHS,
+    server_timing=request_log_settings.SERVER_TIMING_ENABLED,
+)
 
 # Мапа HTTP статусів до ключів перекладу
 error_keys = {
@@ -37,7 +61,8 @@ error_keys = {
     401: "error.unauthorized",
     403: "error.forbidden",
     404: "error.notFound",
-    500: "error.serverError"
+    500: "error.serverError",
+    503: "error.serviceUnavailable"
 }
 
 # Кастомний обробник HTTPException
@@ -64,5 +89,6 @@ app.include_router(auth.router)
 app.include_router(company.router)
 app.include_router(company_actions.router)
 app.include_router(owned_companies.router)
+app.include_router(metrics.router)
 
 logger.info("Backend API has been initialized.")
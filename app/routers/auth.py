@@ -2,8 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.db.models.user import User
-from app.schemas.auth import Token
+from app.schemas.auth import Principal, Token
 from app.schemas.user import (
     UserDetailResponse,
     SignUpRequest,
@@ -40,24 +39,19 @@ async def register(
 
 
 @router.get("/me", response_model=UserDetailResponse)
-async def get_me(current_user: User = Depends(AuthService.get_current_user)):
-    return UserDetailResponse(
-        id=current_user.id,
-        name=current_user.name,
-        email=current_user.email,
-        age=current_user.age,
-        bio=current_user.bio,
-        profile_picture=current_user.profile_picture,
-        friends=[
-            {"id": friend.id, "name": friend.name} for friend in current_user.friends
-        ],
-    )
+async def get_me(
+    current_user: Principal = Depends(AuthService.get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    # Повний профіль з друзями потрібен лише тут, тож беремо його з кешу профілів
+    user_service = UserService(db)
+    return await user_service.get_user(current_user.id)
 
 
 @router.post("/me", response_model=UserDetailResponse)
 async def update_me(
     user_update: UserUpdateRequest,
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     user_service = UserService(db)
@@ -67,7 +61,7 @@ async def update_me(
 
 @router.delete("/me", response_model=dict)
 async def delete_me(
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     user_service = UserService(db)
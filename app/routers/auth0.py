@@ -1,17 +1,16 @@
-import asyncio
 import logging
-import requests
 from fastapi import APIRouter, HTTPException, Query, Depends
 from starlette.responses import RedirectResponse
-from fastapi.concurrency import run_in_threadpool
 
 from app.core.config import auth0_settings
 from app.services.auth0_service import (
-    decode_and_update_db,
+    AUTH0_USER_SYNC_JOB,
     validate_token,
     get_auth0_token,
 )
 from app.schemas.auth0 import UserClaims
+from app.services.http_client import auth0_client
+from app.services.job_queue import job_queue
 
 router = APIRouter(prefix="/auth0", tags=["Auth0 Authentication"])
 logger = logging.getLogger(__name__)
@@ -41,26 +40,29 @@ async def auth0_get_access_token(code: str = Query(...)):
     }
     headers = {"content-type": "application/x-www-form-urlencoded"}
 
-    response = await run_in_threadpool(
-        requests.post,
-        auth0_settings.AUTH0_TOKEN_ENDPOINT,
-        data=payload,
-        headers=headers,
+    # Код авторизації одноразовий, тому запит не повторюємо
+    response = await auth0_client.post(
+        auth0_settings.AUTH0_TOKEN_ENDPOINT, data=payload, headers=headers, retries=0
     )
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.json())
 
     token_data = response.json()
-    asyncio.create_task(decode_and_update_db(token_data))
+    # У черзі зберігаємо лише id_token, access/refresh токени туди не потрапляють
+    await job_queue.enqueue(
+        AUTH0_USER_SYNC_JOB, {"id_token": token_data.get("id_token")}
+    )
     return token_data
 
 
 @router.post("/token/client")
 async def auth0_token():
     try:
-        token = get_auth0_token()
+        token = await get_auth0_token()
         return {"access_token": token}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.services.company import CompanyService
 from app.schemas.company import (
     CompanyCreate,
@@ -8,17 +9,27 @@ from app.schemas.company import (
     CompanyResponse,
     CompaniesListResponse,
 )
-from app.db.models.user import User
+from app.schemas.auth import Principal
 from app.services.auth_service import AuthService
+from app.core.config import pagination_settings
+from typing import Optional
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
 @router.get("/", response_model=CompaniesListResponse)
 async def get_companies(
-    skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     service = CompanyService(db)
-    return await service.get_companies(skip=skip, limit=limit)
+    return await service.get_companies(skip=skip, limit=limit, cursor=cursor)
+
+@router.get("/stream")
+async def stream_companies(db: AsyncSession = Depends(get_db)):
+    service = CompanyService(db)
+    return StreamingResponse(service.stream_companies(), media_type="application/x-ndjson")
 
 @router.get("/{company_id}", response_model=CompanyResponse)
 async def get_company(company_id: int, db: AsyncSession = Depends(get_db)):
@@ -29,7 +40,7 @@ async def get_company(company_id: int, db: AsyncSession = Depends(get_db)):
 async def create_company(
     company: CompanyCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
 ):
     service = CompanyService(db)
     return await service.create_company(company, owner_id=current_user.id)
@@ -39,7 +50,7 @@ async def update_company(
     company_id: int,
     company: CompanyUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
 ):
     service = CompanyService(db)
     return await service.update_company(company_id, company, current_user_id=current_user.id)
@@ -48,7 +59,7 @@ async def update_company(
 async def delete_company(
     company_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
 ):
     service = CompanyService(db)
     return await service.delete_company(company_id, current_user_id=current_user.id)
@@ -1,18 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.services.company_actions import CompanyActionsService
 from app.schemas.company_actions import (
+    BulkInvitationCreate,
+    BulkInvitationResponse,
+    BulkMembershipRequestAction,
+    BulkMembershipRequestResponse,
     CompanyInvitationCreate,
     CompanyInvitationResponse,
     CompanyMembershipRequestResponse,
     CompanyMembershipRequestDetailResponse,
-    CompanyMemberResponse
+    InvitationStatus,
+    MembershipRequestStatus,
+    CompanyMemberResponse,
+    CompanyMemberWithUserResponse
 )
 from app.schemas.company import CompanyResponse  # Для нового маршруту
-from app.db.models.user import User
+from app.schemas.auth import Principal
 from app.services.auth_service import AuthService
-from app.core.logger import logger
+from app.core.config import bulk_settings, pagination_settings
+from app.utils.csv_ids import read_csv_ids
+from app.utils.pagination import set_cursor_headers
+from typing import Literal, Optional
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/companies", tags=["Company Actions"])
 
@@ -22,7 +36,7 @@ async def invite_user(
         company_id: int,
         invitation: CompanyInvitationCreate,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint invite_user called with company_id=%s, invited_user_id=%s, current_user=%s", company_id, invitation.invited_user_id, current_user.id)
     service = CompanyActionsService(db)
@@ -30,11 +44,35 @@ async def invite_user(
     logger.info("Invitation created with id=%s", result.id)
     return result
 
+@router.post("/{company_id}/invite/bulk", response_model=BulkInvitationResponse)
+async def invite_users(
+        company_id: int,
+        invitations: BulkInvitationCreate,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
+):
+    logger.info("Endpoint invite_users called with company_id=%s, %s users, current_user=%s", company_id, len(invitations.invited_user_ids), current_user.id)
+    service = CompanyActionsService(db)
+    return await service.send_invitations(company_id, invitations.invited_user_ids, current_user)
+
+@router.post("/{company_id}/invite/bulk/csv", response_model=BulkInvitationResponse)
+async def invite_users_csv(
+        company_id: int,
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
+):
+    logger.info("Endpoint invite_users_csv called with company_id=%s, current_user=%s", company_id, current_user.id)
+    # Тіло — CSV з id користувачів у першій колонці, заголовок необов'язковий
+    invited_user_ids = await read_csv_ids(request.stream(), bulk_settings.BULK_MAX_ITEMS)
+    service = CompanyActionsService(db)
+    return await service.send_invitations(company_id, invited_user_ids, current_user)
+
 @router.delete("/invitations/{invitation_id}", response_model=CompanyInvitationResponse)
 async def cancel_invitation(
         invitation_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint cancel_invitation called with invitation_id=%s, current_user=%s", invitation_id, current_user.id)
     service = CompanyActionsService(db)
@@ -46,7 +84,7 @@ async def cancel_invitation(
 async def accept_invitation(
         invitation_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint accept_invitation called with invitation_id=%s, current_user=%s", invitation_id, current_user.id)
     service = CompanyActionsService(db)
@@ -58,7 +96,7 @@ async def accept_invitation(
 async def decline_invitation(
         invitation_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint decline_invitation called with invitation_id=%s, current_user=%s", invitation_id, current_user.id)
     service = CompanyActionsService(db)
@@ -71,7 +109,7 @@ async def decline_invitation(
 async def request_membership(
         company_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint request_membership called with company_id=%s, current_user=%s", company_id, current_user.id)
     service = CompanyActionsService(db)
@@ -81,20 +119,26 @@ async def request_membership(
 
 @router.get("/membership-requests/my", response_model=list[CompanyMembershipRequestDetailResponse])
 async def get_user_membership_requests(
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        request: Request,
+        response: Response,
+        status: Optional[MembershipRequestStatus] = None,
+        limit: Optional[int] = Query(None, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
-    logger.info("Endpoint get_user_membership_requests called for current_user=%s", current_user.id)
+    logger.info("Endpoint get_user_membership_requests called for current_user=%s, status=%s, limit=%s, cursor=%s", current_user.id, status, limit, cursor)
     service = CompanyActionsService(db)
-    result = await service.get_membership_requests_for_user(current_user)
+    result, next_cursor = await service.get_membership_requests_for_user(current_user, status, limit, cursor)
     logger.info("Found %s membership requests for user %s", len(result), current_user.id)
+    set_cursor_headers(request, response, next_cursor)
     return result
 
 @router.delete("/membership-requests/{request_id}", response_model=CompanyMembershipRequestResponse)
 async def cancel_membership_request(
         request_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint cancel_membership_request called with request_id=%s, current_user=%s", request_id, current_user.id)
     service = CompanyActionsService(db)
@@ -102,12 +146,24 @@ async def cancel_membership_request(
     logger.info("Membership request %s cancelled", request_id)
     return result
 
+@router.put("/{company_id}/membership-requests/bulk", response_model=BulkMembershipRequestResponse)
+async def handle_membership_requests(
+        company_id: int,
+        body: BulkMembershipRequestAction,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
+):
+    logger.info("Endpoint handle_membership_requests called with company_id=%s, action=%s, all_pending=%s, current_user=%s", company_id, body.action, body.all_pending, current_user.id)
+    service = CompanyActionsService(db)
+    request_ids = None if body.all_pending else body.request_ids
+    return await service.handle_membership_requests(company_id, body.action, request_ids, current_user)
+
 @router.put("/membership-requests/{request_id}/{action}", response_model=CompanyMembershipRequestResponse)
 async def handle_membership_request(
         request_id: int,
         action: str,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint handle_membership_request called with request_id=%s, action=%s, current_user=%s", request_id, action, current_user.id)
     if action not in ["accept", "decline"]:
@@ -123,7 +179,7 @@ async def handle_membership_request(
 async def leave_company(
         company_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint leave_company called with company_id=%s, current_user=%s", company_id, current_user.id)
     service = CompanyActionsService(db)
@@ -136,7 +192,7 @@ async def remove_member(
         company_id: int,
         member_user_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint remove_member called with company_id=%s, member_user_id=%s, current_user=%s", company_id, member_user_id, current_user.id)
     service = CompanyActionsService(db)
@@ -147,58 +203,89 @@ async def remove_member(
 # --- Ендпоінти для перегляду запрошень та заявок ---
 @router.get("/invitations/my", response_model=list[CompanyInvitationResponse])
 async def get_user_invitations(
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        request: Request,
+        response: Response,
+        status: Optional[InvitationStatus] = None,
+        limit: Optional[int] = Query(None, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
-    logger.info("Endpoint get_user_invitations called for current_user=%s", current_user.id)
+    logger.info("Endpoint get_user_invitations called for current_user=%s, status=%s, limit=%s, cursor=%s", current_user.id, status, limit, cursor)
     service = CompanyActionsService(db)
-    result = await service.get_invitations_for_user(current_user)
+    result, next_cursor = await service.get_invitations_for_user(current_user, status, limit, cursor)
     logger.info("Found %s invitations for user %s", len(result), current_user.id)
+    set_cursor_headers(request, response, next_cursor)
     return result
 
 @router.get("/{company_id}/invitations", response_model=list[CompanyInvitationResponse])
 async def get_company_invitations(
         company_id: int,
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        request: Request,
+        response: Response,
+        status: Optional[InvitationStatus] = None,
+        limit: Optional[int] = Query(None, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
-    logger.info("Endpoint get_company_invitations called with company_id=%s, current_user=%s", company_id, current_user.id)
+    logger.info("Endpoint get_company_invitations called with company_id=%s, current_user=%s, status=%s, limit=%s, cursor=%s", company_id, current_user.id, status, limit, cursor)
     service = CompanyActionsService(db)
-    result = await service.get_invitations_for_company(company_id, current_user)
+    result, next_cursor = await service.get_invitations_for_company(company_id, current_user, status, limit, cursor)
     logger.info("Found %s invitations for company %s", len(result), company_id)
+    set_cursor_headers(request, response, next_cursor)
     return result
 
 @router.get("/{company_id}/membership-requests", response_model=list[CompanyMembershipRequestResponse])
 async def get_company_membership_requests(
         company_id: int,
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        request: Request,
+        response: Response,
+        status: Optional[MembershipRequestStatus] = None,
+        limit: Optional[int] = Query(None, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
-    logger.info("Endpoint get_company_membership_requests called with company_id=%s, current_user=%s", company_id, current_user.id)
+    logger.info("Endpoint get_company_membership_requests called with company_id=%s, current_user=%s, status=%s, limit=%s, cursor=%s", company_id, current_user.id, status, limit, cursor)
     service = CompanyActionsService(db)
-    result = await service.get_membership_requests_for_company(company_id, current_user)
+    result, next_cursor = await service.get_membership_requests_for_company(company_id, current_user, status, limit, cursor)
     logger.info("Found %s membership requests for company %s", len(result), company_id)
+    set_cursor_headers(request, response, next_cursor)
     return result
 
 @router.get("/{company_id}/members", response_model=dict)
 async def get_company_members(
         company_id: int,
-        skip: int = 0,
-        limit: int = 10,
-        db: AsyncSession = Depends(get_db)
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include: Optional[Literal["user"]] = None,
+        db: AsyncSession = Depends(get_read_db)
 ):
-    logger.info("Endpoint get_company_members called with company_id=%s, skip=%s, limit=%s", company_id, skip, limit)
+    logger.info("Endpoint get_company_members called with company_id=%s, skip=%s, limit=%s, cursor=%s, include=%s", company_id, skip, limit, cursor, include)
     service = CompanyActionsService(db)
-    members, total = await service.get_company_members(company_id, skip, limit)
+    include_user = include == "user"
+    members, total, next_cursor = await service.get_company_members(company_id, skip, limit, cursor, include_user=include_user)
     logger.info("Returning %s members out of total %s for company %s", len(members), total, company_id)
-    members_data = [CompanyMemberResponse.from_orm(member) for member in members]
-    return {"members": members_data, "total": total}
+    schema = CompanyMemberWithUserResponse if include_user else CompanyMemberResponse
+    members_data = [schema.from_orm(member) for member in members]
+    return {"members": members_data, "total": total, "next_cursor": next_cursor}
+
+@router.get("/{company_id}/members/stream")
+async def stream_company_members(
+        company_id: int,
+        db: AsyncSession = Depends(get_db)
+):
+    logger.info("Endpoint stream_company_members called with company_id=%s", company_id)
+    service = CompanyActionsService(db)
+    return StreamingResponse(service.stream_company_members(company_id), media_type="application/x-ndjson")
 
 # --- Додатковий маршрут для отримання компаній, де користувач є учасником (але не власником) ---
 @router.get("/members/me", response_model=list[CompanyResponse])
 async def get_companies_for_member(
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(AuthService.get_current_user)
+        db: AsyncSession = Depends(get_read_db),
+        current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("Endpoint get_companies_for_member called for current_user=%s", current_user.id)
     service = CompanyActionsService(db)
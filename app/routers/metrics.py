@@ -0,0 +1,44 @@
+from fastapi import APIRouter
+from app.core.logger import log_queue_handler
+from app.db.database import engine, replica_set
+from app.db.pool import pool_stats
+from app.db.query_log import slow_queries
+from app.services.cache import cache_metrics, local_cache
+from app.services.job_queue import job_queue
+from app.services.password_hasher import password_hasher
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/cache")
+def get_cache_metrics():
+    return {"namespaces": cache_metrics, "local_entries": len(local_cache)}
+
+
+@router.get("/passwords")
+def get_password_metrics():
+    return password_hasher.metrics
+
+
+@router.get("/jobs")
+def get_job_metrics():
+    return job_queue.metrics
+
+
+@router.get("/slow-queries")
+def get_slow_queries():
+    return list(slow_queries)
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    return {"primary": pool_stats(engine), "replicas": replica_set.stats()}
+
+
+@router.get("/logging")
+def get_logging_metrics():
+    return {
+        "queued": log_queue_handler.queue.qsize(),
+        "dropped": log_queue_handler.dropped,
+        "rate_limited": log_queue_handler.rate_limited,
+    }
@@ -1,33 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.services.company import CompanyService
 from app.services.company_actions import CompanyActionsService
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
-from app.db.models.user import User
+from app.schemas.auth import Principal
 from app.services.auth_service import AuthService
 from app.core.logger import logger
+from app.core.config import pagination_settings
+from typing import Optional
 
 router = APIRouter(prefix="/companies/owned", tags=["Owned Companies"])
 
 @router.get("/", response_model=dict)
 async def get_owned_companies(
-    skip: int = 0,
-    limit: int = 10,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("GET /companies/owned: Current user %s requested owned companies", current_user.id)
     service = CompanyActionsService(db)
-    companies, total = await service.get_user_companies(current_user.id, skip, limit)
+    companies, total, next_cursor = await service.get_user_companies(current_user.id, skip, limit, cursor)
     companies_data = [CompanyResponse.from_orm(company) for company in companies]
-    return {"companies": companies_data, "total": total}
+    return {"companies": companies_data, "total": total, "next_cursor": next_cursor}
+
+@router.get("/stream")
+async def stream_owned_companies(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(AuthService.get_current_user)
+):
+    logger.info("GET /companies/owned/stream: Current user %s requested owned companies stream", current_user.id)
+    service = CompanyActionsService(db)
+    return StreamingResponse(service.stream_user_companies(current_user.id), media_type="application/x-ndjson")
 
 @router.post("/", response_model=CompanyResponse)
 async def create_owned_company(
     company: CompanyCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("POST /companies/owned: User %s is creating a company", current_user.id)
     service = CompanyService(db)
@@ -38,7 +51,7 @@ async def update_owned_company(
     company_id: int,
     company: CompanyUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("PUT /companies/owned/%s: User %s is updating company", company_id, current_user.id)
     service = CompanyService(db)
@@ -48,7 +61,7 @@ async def update_owned_company(
 async def delete_owned_company(
     company_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    current_user: Principal = Depends(AuthService.get_current_user)
 ):
     logger.info("DELETE /companies/owned/%s: User %s is deleting company", company_id, current_user.id)
     service = CompanyService(db)
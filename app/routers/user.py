@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schemas.user import (
     UserDetailResponse,
     UserUpdateRequest,
@@ -8,18 +9,29 @@ from app.schemas.user import (
     UsersListResponse,
 )
 from app.services.user import UserService
-from app.db.models.user import User
+from app.schemas.auth import Principal
 from app.services.auth_service import AuthService
+from app.core.config import pagination_settings
+from typing import Optional
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/", response_model=UsersListResponse)
 async def read_users(
-    skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=pagination_settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     service = UserService(db)
-    return await service.get_users(skip=skip, limit=limit)
+    return await service.get_users(skip=skip, limit=limit, cursor=cursor)
+
+
+@router.get("/stream")
+async def stream_users(db: AsyncSession = Depends(get_db)):
+    service = UserService(db)
+    return StreamingResponse(service.stream_users(), media_type="application/x-ndjson")
 
 
 @router.get("/{user_id}", response_model=UserDetailResponse)
@@ -39,7 +51,7 @@ async def update_existing_user(
     user_id: int,
     user_data: UserUpdateRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
 ):
     if current_user.id != user_id:
         raise HTTPException(
@@ -54,7 +66,7 @@ async def update_existing_user(
 async def remove_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user),
+    current_user: Principal = Depends(AuthService.get_current_user),
 ):
     if current_user.id != user_id:
         raise HTTPException(
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Token(BaseModel):
@@ -8,3 +8,10 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: str | None = None
+
+
+class Principal(BaseModel):
+    id: int
+    email: str
+
+    model_config = ConfigDict(from_attributes=True)
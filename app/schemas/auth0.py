@@ -10,3 +10,9 @@ class UserClaims(BaseModel):
     family_name: str
     picture: str
     permissions: List[str]
+
+
+class ClientToken(BaseModel):
+    access_token: str
+    expires_at: float
+    refresh_at: float
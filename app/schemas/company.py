@@ -42,3 +42,4 @@ class CompanyResponse(CompanyBase):
 class CompaniesListResponse(BaseModel):
     companies: List[CompanyResponse]
     total: int
+    next_cursor: Optional[str] = None
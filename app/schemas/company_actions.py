@@ -1,8 +1,11 @@
 # app/schemas/company_actions.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
 from datetime import datetime
+from typing import Literal, Optional
+from app.core.config import bulk_settings
 from app.schemas.company import CompanyResponse  # Для вкладеного об’єкта компанії
+from app.schemas.user import UserSummary
 
 class InvitationStatus(str, Enum):
     pending = "pending"
@@ -20,6 +23,9 @@ class MembershipRequestStatus(str, Enum):
 class CompanyInvitationCreate(BaseModel):
     invited_user_id: int
 
+class BulkInvitationCreate(BaseModel):
+    invited_user_ids: list[int] = Field(..., min_length=1, max_length=bulk_settings.BULK_MAX_ITEMS)
+
 class CompanyInvitationResponse(BaseModel):
     id: int
     company_id: int
@@ -30,6 +36,17 @@ class CompanyInvitationResponse(BaseModel):
     class Config:
         orm_mode = True
 
+# Результат по кожному id: invitation_id для створених, error — ключ помилки для пропущених
+class BulkInvitationOutcome(BaseModel):
+    invited_user_id: int
+    invitation_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkInvitationResponse(BaseModel):
+    invited: int
+    skipped: int
+    results: list[BulkInvitationOutcome]
+
 # Схеми для заявок на членство
 class CompanyMembershipRequestCreate(BaseModel):
     # Додаткових даних не потрібно, оскільки user_id визначається з поточного користувача
@@ -45,6 +62,27 @@ class CompanyMembershipRequestResponse(BaseModel):
     class Config:
         orm_mode = True
 
+# Масова обробка: або перелік request_ids, або all_pending=True
+class BulkMembershipRequestAction(BaseModel):
+    action: Literal["accept", "decline"]
+    request_ids: Optional[list[int]] = Field(None, min_length=1, max_length=bulk_settings.BULK_MAX_ITEMS)
+    all_pending: bool = False
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.request_ids is None) == (not self.all_pending):
+            raise ValueError("Provide either request_ids or all_pending")
+        return self
+
+class BulkMembershipRequestFailure(BaseModel):
+    request_id: int
+    error: str
+
+class BulkMembershipRequestResponse(BaseModel):
+    processed: int
+    members_added: int
+    failed: list[BulkMembershipRequestFailure]
+
 # Нова схема для відповіді з вкладеним об’єктом компанії
 class CompanyMembershipRequestDetailResponse(CompanyMembershipRequestResponse):
     company: CompanyResponse
@@ -59,3 +97,6 @@ class CompanyMemberResponse(BaseModel):
     class Config:
         orm_mode = True
         from_attributes = True
+
+class CompanyMemberWithUserResponse(CompanyMemberResponse):
+    user: UserSummary
@@ -6,6 +6,17 @@ class Friend(BaseModel):
     id: int
     name: str
 
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Мінімальні дані користувача для вкладення в інші відповіді, без друзів
+class UserSummary(BaseModel):
+    id: int
+    name: str
+    profile_picture: Optional[HttpUrl] = Field(None, alias="profilePicture")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
 
 class UserBase(BaseModel):
     name: str
@@ -44,3 +55,4 @@ class UserDetailResponse(UserBase):
 class UsersListResponse(BaseModel):
     users: List[UserDetailResponse]
     total: int
+    next_cursor: Optional[str] = None
@@ -1,77 +1,126 @@
+import hashlib
 import logging
-import requests
+import time
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jws, jwt, ExpiredSignatureError, JWTError, JWSError
 from jose.exceptions import JWTClaimsError
-from typing import Annotated
-from sqlalchemy.future import select
+from typing import Annotated, Optional
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import auth0_settings
 from app.db.database import AsyncSessionLocal
 from app.db.models.user import User, Auth0User
 from app.schemas.auth0 import UserClaims
+from app.services.counter import CounterService, USERS_TOTAL_KEY
+from app.services.cache import claims_cache, user_cache
+from app.services.client_token import ClientTokenCache
+from app.services.http_client import auth0_client
+from app.services.job_queue import job_queue
+from app.services.jwks import jwks_manager
+from app.utils.upsert import insert_for
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-jwks = requests.get(auth0_settings.AUTH0_JWKS_ENDPOINT).json()["keys"]
+AUTH0_USER_SYNC_JOB = "auth0_user_sync"
 
 
-def get_auth0_token():
+async def fetch_client_token(audience: str) -> dict:
     payload = {
         "grant_type": "client_credentials",
         "client_id": auth0_settings.AUTH0_CLIENT_ID,
         "client_secret": auth0_settings.AUTH0_CLIENT_SECRET,
-        "audience": auth0_settings.AUTH0_AUDIENCE,
+        "audience": audience,
     }
     headers = {"content-type": "application/x-www-form-urlencoded"}
 
-    response = requests.post(
+    response = await auth0_client.post(
         auth0_settings.AUTH0_TOKEN_ENDPOINT, data=payload, headers=headers
     )
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.json())
-    return response.json().get("access_token")
+    return response.json()
+
+
+client_token_cache = ClientTokenCache(
+    fetch_client_token,
+    refresh_margin=auth0_settings.AUTH0_CLIENT_TOKEN_REFRESH_MARGIN,
+)
+
+
+async def get_auth0_token(audience: Optional[str] = None):
+    return await client_token_cache.get(audience or auth0_settings.AUTH0_AUDIENCE)
 
 
 def find_public_key(kid: str):
-    for key in jwks:
-        if key["kid"] == kid:
-            return key
-    return None
+    return jwks_manager.find(kid)
+
+
+async def get_public_key(kid: str):
+    key = find_public_key(kid)
+    if key is None:
+        key = await jwks_manager.get(kid)
+    return key
+
+
+def claims_from(data: dict, permissions: list[str]) -> UserClaims:
+    return UserClaims(
+        sub=data.get("sub", ""),
+        email=data.get("email", ""),
+        name=data.get("name", ""),
+        given_name=data.get("given_name", ""),
+        family_name=data.get("family_name", ""),
+        picture=data.get("picture", ""),
+        permissions=permissions,
+    )
 
 
-def validate_token(
+async def fetch_userinfo(token: str) -> UserClaims:
+    userinfo_response = await auth0_client.get(
+        "/userinfo", headers={"Authorization": f"Bearer {token}"}
+    )
+    if userinfo_response.status_code != 200:
+        raise HTTPException(status_code=401, detail="error.unauthorized")
+    return claims_from(userinfo_response.json(), [])
+
+
+async def validate_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
 ):
+    token = credentials.credentials
     try:
-        unverified_headers = jws.get_unverified_header(credentials.credentials)
-        jwt.decode(
-            token=credentials.credentials,
-            key=find_public_key(unverified_headers["kid"]),
+        unverified_headers = jws.get_unverified_header(token)
+        public_key = await get_public_key(unverified_headers.get("kid"))
+        if not public_key:
+            raise HTTPException(status_code=401, detail="error.auth.couldNotValidate")
+        payload = jwt.decode(
+            token=token,
+            key=public_key,
             audience=auth0_settings.AUTH0_AUDIENCE,
             algorithms=["RS256"],
         )
-        userinfo_response = requests.get(
-            f"https://{auth0_settings.AUTH0_DOMAIN}/userinfo",
-            headers={"Authorization": f"Bearer {credentials.credentials}"},
-        )
-        if userinfo_response.status_code != 200:
-            raise HTTPException(status_code=401, detail="error.unauthorized")
-        userinfo = userinfo_response.json()
-        return UserClaims(
-            sub=userinfo.get("sub", ""),
-            email=userinfo.get("email", ""),
-            name=userinfo.get("name", ""),
-            given_name=userinfo.get("given_name", ""),
-            family_name=userinfo.get("family_name", ""),
-            picture=userinfo.get("picture", ""),
-            permissions=[],
-        )
     except (ExpiredSignatureError, JWTError, JWTClaimsError, JWSError) as error:
         raise HTTPException(status_code=401, detail="error.auth.couldNotValidate")
 
+    # Токен уже перевірений, тож його claims можна взяти без /userinfo
+    if auth0_settings.AUTH0_CLAIMS_FROM_TOKEN and payload.get("email"):
+        return claims_from(payload, payload.get("permissions", []))
+
+    # Відповідь /userinfo валідна, поки живе токен
+    ttl = int(payload.get("exp", 0) - time.time())
+    if ttl <= 0:
+        return await fetch_userinfo(token)
+    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    return await claims_cache.get_or_load(
+        token_hash, lambda: fetch_userinfo(token), ttl=ttl
+    )
+
+
+class Auth0SyncUnavailable(Exception):
+    """Тимчасовий збій синхронізації: задача має впасти, щоб черга її повторила."""
+
 
 async def decode_and_update_db(token_data: dict):
     logger.info("Starting background task for processing id_token")
@@ -81,23 +130,28 @@ async def decode_and_update_db(token_data: dict):
         return
 
     try:
-        unverified_header = jwt.get_unverified_header(id_token)
-        public_key = find_public_key(unverified_header.get("kid"))
-        if not public_key:
-            logger.error(
-                "Public key not found for kid: %s", unverified_header.get("kid")
-            )
-            return
+        kid = jwt.get_unverified_header(id_token).get("kid")
+    except JWTError as e:
+        logger.error("Malformed id_token, dropping sync: %s", e)
+        return
+
+    public_key = await get_public_key(kid)
+    if not public_key:
+        # JWKS недоступний або ключі щойно змінились — повтор через чергу
+        raise Auth0SyncUnavailable(f"Public key not found for kid: {kid}")
+
+    try:
         decoded_token = jwt.decode(
             token=id_token,
             key=public_key,
             audience=auth0_settings.AUTH0_CLIENT_ID,
             algorithms=["RS256"],
         )
-        logger.info("Decoded token: %s", decoded_token)
-    except Exception as e:
-        logger.exception("Error decoding id_token: %s", e)
+    except (ExpiredSignatureError, JWTError, JWTClaimsError, JWSError) as e:
+        # Прострочений або підроблений токен повтор не виправить
+        logger.error("Invalid id_token, dropping sync: %s", e)
         return
+    logger.info("Decoded token: %s", decoded_token)
 
     auth0_sub = decoded_token.get("sub")
     email = decoded_token.get("email")
@@ -112,35 +166,53 @@ async def decode_and_update_db(token_data: dict):
         return
 
     async with AsyncSessionLocal() as db:
-        result = await db.execute(select(User).where(User.email == email))
-        user = result.scalars().first()
-        if not user:
-            user = User(
-                auth0_sub=auth0_sub, email=email, name=name, profile_picture=picture
-            )
-            db.add(user)
-            await db.commit()
-            await db.refresh(user)
-            logger.info("Created new user: %s", user.email)
-        else:
-            user.auth0_sub = auth0_sub
-            user.name = name
-            user.profile_picture = picture
-            await db.commit()
-            logger.info("Updated user data: %s", user.email)
-
-        result2 = await db.execute(
-            select(Auth0User).where(Auth0User.auth0_sub == auth0_sub)
+        await sync_auth0_user(db, auth0_sub, email, name, picture, email_verified)
+
+
+async def sync_auth0_user(
+    db: AsyncSession,
+    auth0_sub: str,
+    email: str,
+    name: str,
+    picture: Optional[str],
+    email_verified: bool,
+) -> int:
+    # Користувач і його Auth0User оновлюються двома upsert в одній транзакції
+    users_insert = insert_for(db, User)
+    user_stmt = (
+        users_insert.values(
+            auth0_sub=auth0_sub, email=email, name=name, profile_picture=picture
         )
-        auth0_user = result2.scalars().first()
-        if not auth0_user:
-            auth0_user = Auth0User(
-                user_id=user.id,
-                auth0_sub=auth0_sub,
-                email_verified=email_verified,
+        .on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                "auth0_sub": users_insert.excluded.auth0_sub,
+                "name": users_insert.excluded.name,
+                "profile_picture": users_insert.excluded.profile_picture,
+                "updated_at": func.now(),
+            },
+        )
+        .returning(User.id, (User.created_at == User.updated_at).label("created"))
+    )
+    auth0_insert = insert_for(db, Auth0User)
+    async with db.begin():
+        user_id, created = (await db.execute(user_stmt)).one()
+        await db.execute(
+            auth0_insert.values(
+                user_id=user_id, auth0_sub=auth0_sub, email_verified=email_verified
+            ).on_conflict_do_update(
+                index_elements=[Auth0User.auth0_sub],
+                set_={"email_verified": auth0_insert.excluded.email_verified},
             )
-            db.add(auth0_user)
-            await db.commit()
-            logger.info("Created Auth0User record for user: %s", user.email)
-        else:
-            logger.info("Auth0User record already exists for user: %s", user.email)
+        )
+
+    if created:
+        await CounterService.adjust(USERS_TOTAL_KEY, 1)
+        logger.info("Created new user: %s", email)
+    else:
+        await user_cache.invalidate(user_id)
+        logger.info("Updated user data: %s", email)
+    return user_id
+
+
+job_queue.register(AUTH0_USER_SYNC_JOB, decode_and_update_db)
@@ -2,19 +2,17 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
 from app.db.database import get_db
 from app.db.models.user import User
 from app.core.config import security_settings
-from app.schemas.auth import TokenData
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.schemas.auth import Principal, TokenData
+from app.services.cache import principal_cache
+from app.services.password_hasher import password_hasher
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -24,8 +22,8 @@ class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -53,7 +51,7 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="error.auth.incorrectCredentials",
             )
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="error.auth.incorrectCredentials",
@@ -64,7 +62,7 @@ class AuthService:
     async def get_current_user(
         token: str = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db),
-    ) -> User:
+    ) -> Principal:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="error.auth.couldNotValidate",
@@ -87,12 +85,14 @@ class AuthService:
         except ValueError:
             raise credentials_exception
 
-        result = await db.execute(
-            select(User)
-            .options(selectinload(User.friends))
-            .filter(User.id == user_id_int)
-        )
-        user = result.scalars().first()
-        if user is None:
-            raise credentials_exception
-        return user
+        async def load_principal() -> Principal:
+            # Лише id та email — без гідрації User і списку друзів
+            result = await db.execute(
+                select(User.id, User.email).filter(User.id == user_id_int)
+            )
+            row = result.first()
+            if row is None:
+                raise credentials_exception
+            return Principal.model_validate(row)
+
+        return await principal_cache.get_or_load(user_id_int, load_principal)
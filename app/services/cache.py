@@ -0,0 +1,204 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Optional, Type, TypeVar, Union
+from pydantic import BaseModel, ValidationError
+from redis.exceptions import RedisError
+
+from app.core.config import cache_settings
+from app.core.logger import logger
+from app.db.redis import redis_client
+from app.schemas.auth import Principal
+from app.schemas.auth0 import UserClaims
+from app.schemas.company import CompanyResponse
+from app.schemas.user import UserDetailResponse
+from app.services.single_flight import single_flight
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+EntityId = Union[int, str]
+
+# Лічильники влучань/промахів по кожному простору імен (в межах воркера)
+cache_metrics: dict[str, dict[str, int]] = {}
+
+
+class LocalCache:
+    """Обмежений LRU-кеш з TTL у пам'яті воркера."""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+local_cache = LocalCache(
+    max_size=cache_settings.LOCAL_CACHE_MAX_SIZE, ttl=cache_settings.LOCAL_CACHE_TTL
+)
+
+
+async def publish_invalidation(*keys: str) -> None:
+    try:
+        await redis_client.publish(
+            cache_settings.CACHE_INVALIDATION_CHANNEL, json.dumps(keys)
+        )
+    except RedisError as e:
+        logger.warning("Failed to publish cache invalidation for %s: %s", keys, e)
+
+
+async def listen_for_invalidations(retry_delay: float = 1.0) -> None:
+    # Тримаємо локальні кеші всіх воркерів узгодженими після записів
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(cache_settings.CACHE_INVALIDATION_CHANNEL)
+            # Поки підписки не було, інвалідації могли загубитись
+            local_cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    local_cache.delete(*json.loads(message["data"]))
+                except (TypeError, ValueError):
+                    logger.warning("Malformed invalidation message: %s", message)
+        except RedisError as e:
+            logger.warning("Cache invalidation listener disconnected: %s", e)
+            await asyncio.sleep(retry_delay)
+        except Exception:
+            # Будь-яка інша помилка не повинна тихо зупинити слухача назавжди;
+            # CancelledError сюди не потрапляє, тож зупинка в lifespan працює
+            logger.exception("Cache invalidation listener failed, resubscribing")
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.close()
+
+
+class DetailCache(Generic[SchemaT]):
+    def __init__(self, namespace: str, schema: Type[SchemaT], ttl: int):
+        self.namespace = namespace
+        self.schema = schema
+        self.ttl = ttl
+        self.metrics = cache_metrics.setdefault(
+            namespace, {"local_hits": 0, "hits": 0, "misses": 0, "errors": 0}
+        )
+
+    def key(self, entity_id: EntityId) -> str:
+        return f"cache:{self.namespace}:{entity_id}"
+
+    async def get(self, entity_id: EntityId) -> Optional[SchemaT]:
+        if not cache_settings.CACHE_ENABLED:
+            return None
+        key = self.key(entity_id)
+        value = local_cache.get(key)
+        if value is not None:
+            self.metrics["local_hits"] += 1
+            return value
+        try:
+            payload = await redis_client.get(key)
+        except RedisError as e:
+            self.metrics["errors"] += 1
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return None
+        if payload is None:
+            self.metrics["misses"] += 1
+            return None
+        try:
+            value = self.schema.model_validate_json(payload)
+        except ValidationError:
+            # Схема змінилась після деплою — вважаємо запис відсутнім
+            self.metrics["misses"] += 1
+            return None
+        self.metrics["hits"] += 1
+        local_cache.set(key, value, ttl=self.ttl)
+        return value
+
+    async def get_or_load(
+        self,
+        entity_id: EntityId,
+        loader: Callable[[], Awaitable[SchemaT]],
+        ttl: Optional[int] = None,
+    ) -> SchemaT:
+        cached = await self.get(entity_id)
+        if cached is not None:
+            return cached
+
+        async def load() -> SchemaT:
+            value = await loader()
+            await self.set(entity_id, value, ttl=ttl)
+            return value
+
+        return await single_flight.do(
+            self.key(entity_id), load, recheck=lambda: self.get(entity_id)
+        )
+
+    async def set(
+        self, entity_id: EntityId, value: SchemaT, ttl: Optional[int] = None
+    ) -> None:
+        if not cache_settings.CACHE_ENABLED:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        key = self.key(entity_id)
+        local_cache.set(key, value, ttl=ttl)
+        try:
+            await redis_client.set(key, value.model_dump_json(), ex=ttl)
+        except RedisError as e:
+            self.metrics["errors"] += 1
+            logger.warning("Cache write failed for %s: %s", key, e)
+
+    async def invalidate(self, *entity_ids: EntityId) -> None:
+        if not cache_settings.CACHE_ENABLED or not entity_ids:
+            return
+        keys = [self.key(i) for i in entity_ids]
+        local_cache.delete(*keys)
+        try:
+            await redis_client.delete(*keys)
+        except RedisError as e:
+            self.metrics["errors"] += 1
+            logger.warning(
+                "Cache invalidation failed for %s %s: %s",
+                self.namespace,
+                entity_ids,
+                e,
+            )
+        await publish_invalidation(*keys)
+
+
+user_cache = DetailCache(
+    "user", UserDetailResponse, ttl=cache_settings.USER_CACHE_TTL
+)
+company_cache = DetailCache(
+    "company", CompanyResponse, ttl=cache_settings.COMPANY_CACHE_TTL
+)
+principal_cache = DetailCache(
+    "principal", Principal, ttl=cache_settings.PRINCIPAL_CACHE_TTL
+)
+claims_cache = DetailCache(
+    "auth0_claims", UserClaims, ttl=cache_settings.AUTH0_CLAIMS_CACHE_TTL
+)
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from app.core.config import cache_settings
+from app.core.logger import logger
+from app.db.redis import redis_client
+from app.schemas.auth0 import ClientToken
+from app.services.single_flight import single_flight
+
+
+class ClientTokenCache:
+    """Тримає client-credentials токени Auth0 по audience в пам'яті та в Redis.
+
+    Токен оновлюється за refresh_margin секунд до закінчення: поки старий ще
+    дійсний, оновлення йде у фоні, а між воркерами його виконує лише власник
+    локу single-flight, решта читають результат з Redis.
+    """
+
+    def __init__(
+        self, fetch: Callable[[str], Awaitable[dict]], refresh_margin: int
+    ):
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self._tokens: dict[str, ClientToken] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def key(audience: str) -> str:
+        return f"auth0:client_token:{audience}"
+
+    async def get(self, audience: str) -> str:
+        now = time.time()
+        token = self._tokens.get(audience)
+        if token is not None and now < token.refresh_at:
+            return token.access_token
+        if token is not None and now < token.expires_at:
+            self._start_refresh(audience)
+            return token.access_token
+        token = await self.refresh(audience)
+        return token.access_token
+
+    async def refresh(self, audience: str) -> ClientToken:
+        token = await single_flight.do(
+            self.key(audience),
+            lambda: self._fetch(audience),
+            recheck=lambda: self._read_shared(audience),
+        )
+        self._tokens[audience] = token
+        return token
+
+    def _start_refresh(self, audience: str) -> None:
+        task = self._refreshing.get(audience)
+        if task is None or task.done():
+            task = asyncio.create_task(self.refresh(audience))
+            task.add_done_callback(self._log_refresh_error)
+            self._refreshing[audience] = task
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            # Старий токен ще дійсний, тож наступний запит спробує знову
+            logger.warning("Background Auth0 token refresh failed: %s", task.exception())
+
+    async def _read_shared(self, audience: str) -> Optional[ClientToken]:
+        if not cache_settings.CACHE_ENABLED:
+            return None
+        try:
+            payload = await redis_client.get(self.key(audience))
+        except RedisError as e:
+            logger.warning("Auth0 token read failed for %s: %s", audience, e)
+            return None
+        if payload is None:
+            return None
+        try:
+            token = ClientToken.model_validate_json(payload)
+        except ValidationError:
+            return None
+        # Токен, який уже пора оновлювати, не рахується свіжим
+        return token if time.time() < token.refresh_at else None
+
+    async def _fetch(self, audience: str) -> ClientToken:
+        # Інший воркер міг оновити токен, поки ми чекали на лок
+        shared = await self._read_shared(audience)
+        if shared is not None:
+            return shared
+
+        issued_at = time.time()
+        data = await self.fetch(audience)
+        expires_in = int(data.get("expires_in", 0))
+        token = ClientToken(
+            access_token=data["access_token"],
+            expires_at=issued_at + expires_in,
+            refresh_at=issued_at + expires_in - min(self.refresh_margin, expires_in / 2),
+        )
+        if cache_settings.CACHE_ENABLED and expires_in > 0:
+            try:
+                await redis_client.set(
+                    self.key(audience), token.model_dump_json(), ex=expires_in
+                )
+            except RedisError as e:
+                logger.warning("Auth0 token write failed for %s: %s", audience, e)
+        logger.info("Fetched Auth0 client token for %s, expires in %ss", audience, expires_in)
+        return token
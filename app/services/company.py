@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+from typing import AsyncIterator, Optional
 from app.db.models.company import Company, VisibilityEnum
 from app.schemas.company import (
     CompanyCreate,
@@ -10,20 +11,38 @@ from app.schemas.company import (
     CompaniesListResponse,
 )
 from app.core.logger import logger
+from app.services.cache import company_cache
+from app.utils.pagination import paginate, split_page
+from app.utils.streaming import ndjson_rows
+from app.services.counter import (
+    CounterService,
+    COMPANIES_TOTAL_KEY,
+    owned_companies_total_key,
+    company_members_total_key,
+)
 
 class CompanyService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_companies(self, skip: int = 0, limit: int = 10) -> CompaniesListResponse:
-        result = await self.db.execute(select(Company).offset(skip).limit(limit))
-        companies = result.scalars().all()
-        total_result = await self.db.execute(select(Company))
-        total = len(total_result.scalars().all())
+    async def get_companies(self, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> CompaniesListResponse:
+        result = await self.db.execute(
+            paginate(select(Company), Company.id, skip=skip, limit=limit, cursor=cursor)
+        )
+        companies, next_cursor = split_page(result.scalars().all(), limit)
+        total = await CounterService(self.db).total(
+            COMPANIES_TOTAL_KEY, select(Company), table_name=Company.__tablename__
+        )
         company_responses = [CompanyResponse.model_validate(company) for company in companies]
-        return CompaniesListResponse(companies=company_responses, total=total)
+        return CompaniesListResponse(companies=company_responses, total=total, next_cursor=next_cursor)
+
+    def stream_companies(self) -> AsyncIterator[str]:
+        return ndjson_rows(self.db, select(Company).order_by(Company.id), CompanyResponse)
 
     async def get_company(self, company_id: int) -> CompanyResponse:
+        return await company_cache.get_or_load(company_id, lambda: self._fetch_company(company_id))
+
+    async def _fetch_company(self, company_id: int) -> CompanyResponse:
         result = await self.db.execute(select(Company).filter(Company.id == company_id))
         company = result.scalars().first()
         if not company:
@@ -56,6 +75,8 @@ class CompanyService:
             await self.db.rollback()
             raise HTTPException(status_code=400, detail="error.company.nameMustBeUnique")
 
+        await CounterService.adjust(COMPANIES_TOTAL_KEY, 1)
+        await CounterService.adjust(owned_companies_total_key(owner_id), 1)
         return CompanyResponse.model_validate(company)
 
     async def update_company(self, company_id: int, company_data: CompanyUpdate, current_user_id: int) -> CompanyResponse:
@@ -85,6 +106,7 @@ class CompanyService:
             await self.db.rollback()
             raise HTTPException(status_code=400, detail="error.company.nameMustBeUnique")
 
+        await company_cache.invalidate(company_id)
         return CompanyResponse.model_validate(company)
 
     async def delete_company(self, company_id: int, current_user_id: int) -> dict:
@@ -97,4 +119,8 @@ class CompanyService:
 
         await self.db.delete(company)
         await self.db.commit()
+        await CounterService.adjust(COMPANIES_TOTAL_KEY, -1)
+        await CounterService.adjust(owned_companies_total_key(current_user_id), -1)
+        await CounterService.invalidate(company_members_total_key(company_id))
+        await company_cache.invalidate(company_id)
         return {"detail": "Company deleted successfully"}
@@ -1,33 +1,59 @@
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import literal, text, update
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, raiseload, selectinload
 from fastapi import HTTPException
 from app.db.models.company_invitation import CompanyInvitation, InvitationStatus
 from app.db.models.company_membership_request import CompanyMembershipRequest, MembershipRequestStatus
 from app.db.models.company_member import CompanyMember
 from app.db.models.company import Company
 from app.db.models.user import User
-from app.core.logger import logger
+from app.schemas.auth import Principal
+from app.utils.pagination import paginate, split_page
+from app.utils.upsert import insert_for
+from app.utils.streaming import ndjson_rows
+from app.schemas.company import CompanyResponse
+from app.schemas.company_actions import (
+    BulkInvitationOutcome,
+    BulkInvitationResponse,
+    BulkMembershipRequestFailure,
+    BulkMembershipRequestResponse,
+    CompanyMemberResponse,
+)
+from typing import AsyncIterator, Optional
+from app.services.counter import CounterService, owned_companies_total_key, company_members_total_key
+
+# Власний логер модуля, щоб його рівень і ліміт INFO налаштовувались окремо
+logger = logging.getLogger(__name__)
+
+# Предикат часткових унікальних індексів; літерал, а не параметр, щоб Postgres
+# міг зіставити ON CONFLICT з індексом
+PENDING_ONLY = text("status = 'pending'")
 
 class CompanyActionsService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     # Отримання компаній користувача (де користувач є власником)
-    async def get_user_companies(self, owner_id: int, skip: int = 0, limit: int = 10) -> tuple[list[Company], int]:
-        logger.info("get_user_companies: Fetching companies for owner %s with skip=%s and limit=%s", owner_id, skip, limit)
-        query = select(Company).filter(Company.owner_id == owner_id).offset(skip).limit(limit)
+    async def get_user_companies(self, owner_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> tuple[list[Company], int, Optional[str]]:
+        logger.info("get_user_companies: Fetching companies for owner %s with skip=%s, limit=%s and cursor=%s", owner_id, skip, limit, cursor)
+        query = paginate(select(Company).filter(Company.owner_id == owner_id), Company.id, skip=skip, limit=limit, cursor=cursor)
         result = await self.db.execute(query)
-        companies = result.scalars().all()
-        total_query = select(Company).filter(Company.owner_id == owner_id)
-        total_result = await self.db.execute(total_query)
-        total = len(total_result.scalars().all())
+        companies, next_cursor = split_page(result.scalars().all(), limit)
+        total = await CounterService(self.db).total(
+            owned_companies_total_key(owner_id), select(Company).filter(Company.owner_id == owner_id)
+        )
         logger.info("get_user_companies: Found %s companies (total %s) for owner %s", len(companies), total, owner_id)
-        return companies, total
+        return companies, total, next_cursor
+
+    def stream_user_companies(self, owner_id: int) -> AsyncIterator[str]:
+        logger.info("stream_user_companies: Streaming companies for owner %s", owner_id)
+        query = select(Company).filter(Company.owner_id == owner_id).order_by(Company.id)
+        return ndjson_rows(self.db, query, CompanyResponse)
 
     # 1. Запрошення
-    async def send_invitation(self, company_id: int, invited_user_id: int, current_user: User) -> CompanyInvitation:
+    async def send_invitation(self, company_id: int, invited_user_id: int, current_user: Principal) -> CompanyInvitation:
         logger.info("send_invitation: User %s requests to invite user %s to company %s", current_user.id, invited_user_id, company_id)
         result = await self.db.execute(select(Company).filter(Company.id == company_id))
         company = result.scalars().first()
@@ -38,202 +64,353 @@ class CompanyActionsService:
             logger.error("send_invitation: User %s is not owner of company %s", current_user.id, company_id)
             # Використовуємо загальний ключ "forbidden" для неавторизованої дії
             raise HTTPException(status_code=403, detail="error.forbidden")
-        existing = await self.db.execute(
-            select(CompanyInvitation).filter(
-                CompanyInvitation.company_id == company_id,
-                CompanyInvitation.invited_user_id == invited_user_id,
-                CompanyInvitation.status == InvitationStatus.pending
+        # Дублікат відсікає частковий унікальний індекс на pending-запрошеннях
+        result = await self.db.execute(
+            insert_for(self.db, CompanyInvitation)
+            .values(company_id=company_id, invited_user_id=invited_user_id, status=InvitationStatus.pending)
+            .on_conflict_do_nothing(
+                index_elements=[CompanyInvitation.company_id, CompanyInvitation.invited_user_id],
+                index_where=PENDING_ONLY,
             )
+            .returning(CompanyInvitation)
         )
-        if existing.scalars().first():
+        invitation = result.scalars().first()
+        if not invitation:
             logger.error("send_invitation: Invitation already exists for user %s in company %s", invited_user_id, company_id)
             raise HTTPException(status_code=400, detail="error.invitation.alreadySent")
-        invitation = CompanyInvitation(
-            company_id=company_id,
-            invited_user_id=invited_user_id,
-            status=InvitationStatus.pending
-        )
-        self.db.add(invitation)
         await self.db.commit()
-        await self.db.refresh(invitation)
         logger.info("send_invitation: Invitation created with id %s", invitation.id)
         return invitation
 
-    async def cancel_invitation(self, invitation_id: int, current_user: User) -> CompanyInvitation:
+    async def send_invitations(self, company_id: int, invited_user_ids: list[int], current_user: Principal) -> BulkInvitationResponse:
+        logger.info("send_invitations: User %s invites %s users to company %s", current_user.id, len(invited_user_ids), company_id)
+        result = await self.db.execute(select(Company.owner_id).filter(Company.id == company_id))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            logger.error("send_invitations: Company %s not found", company_id)
+            raise HTTPException(status_code=404, detail="error.company.notFound")
+        if owner_id != current_user.id:
+            logger.error("send_invitations: User %s is not owner of company %s", current_user.id, company_id)
+            raise HTTPException(status_code=403, detail="error.forbidden")
+
+        user_ids = list(dict.fromkeys(invited_user_ids))
+        # Один запит визначає, хто існує, хто вже учасник і кого вже запрошено
+        is_member = select(CompanyMember.id).where(
+            CompanyMember.company_id == company_id, CompanyMember.user_id == User.id
+        ).exists()
+        has_pending = select(CompanyInvitation.id).where(
+            CompanyInvitation.company_id == company_id,
+            CompanyInvitation.invited_user_id == User.id,
+            CompanyInvitation.status == InvitationStatus.pending,
+        ).exists()
+        result = await self.db.execute(select(User.id, is_member, has_pending).filter(User.id.in_(user_ids)))
+        errors = {user_id: "error.user.notFound" for user_id in user_ids}
+        for user_id, member, pending in result:
+            if member:
+                errors[user_id] = "error.membership.alreadyMember"
+            elif pending:
+                errors[user_id] = "error.invitation.alreadySent"
+            else:
+                del errors[user_id]
+
+        created = {}
+        to_invite = [user_id for user_id in user_ids if user_id not in errors]
+        if to_invite:
+            # Паралельні запрошення тих самих людей відсікає частковий унікальний індекс
+            result = await self.db.execute(
+                insert_for(self.db, CompanyInvitation)
+                .values([
+                    {"company_id": company_id, "invited_user_id": user_id, "status": InvitationStatus.pending}
+                    for user_id in to_invite
+                ])
+                .on_conflict_do_nothing(
+                    index_elements=[CompanyInvitation.company_id, CompanyInvitation.invited_user_id],
+                    index_where=PENDING_ONLY,
+                )
+                .returning(CompanyInvitation.invited_user_id, CompanyInvitation.id)
+            )
+            created = dict(result.all())
+            await self.db.commit()
+
+        results = []
+        for user_id in invited_user_ids:
+            if user_id in created:
+                results.append(BulkInvitationOutcome(invited_user_id=user_id, invitation_id=created.pop(user_id)))
+            else:
+                results.append(BulkInvitationOutcome(
+                    invited_user_id=user_id, error=errors.get(user_id, "error.invitation.alreadySent")
+                ))
+        invited = sum(1 for item in results if item.invitation_id is not None)
+        logger.info("send_invitations: Created %s invitations for company %s, skipped %s", invited, company_id, len(results) - invited)
+        return BulkInvitationResponse(invited=invited, skipped=len(results) - invited, results=results)
+
+    async def cancel_invitation(self, invitation_id: int, current_user: Principal) -> CompanyInvitation:
         logger.info("cancel_invitation: User %s requests to cancel invitation %s", current_user.id, invitation_id)
-        result = await self.db.execute(select(CompanyInvitation).filter(CompanyInvitation.id == invitation_id))
-        invitation = result.scalars().first()
+        invitation = await self._transition(
+            CompanyInvitation, invitation_id, InvitationStatus.pending, InvitationStatus.cancelled,
+            self._owns_company(CompanyInvitation.company_id, current_user),
+        )
         if not invitation:
-            logger.error("cancel_invitation: Invitation %s not found", invitation_id)
-            raise HTTPException(status_code=404, detail="error.invitation.notFound")
-        result_company = await self.db.execute(select(Company).filter(Company.id == invitation.company_id))
-        company = result_company.scalars().first()
-        if company.owner_id != current_user.id:
-            logger.error("cancel_invitation: User %s is not authorized to cancel invitation for company %s", current_user.id, invitation.company_id)
-            raise HTTPException(status_code=403, detail="error.invitation.notAuthorizedCancel")
-        invitation.status = InvitationStatus.cancelled
+            row = await self._invitation_state(invitation_id)
+            if not row:
+                logger.error("cancel_invitation: Invitation %s not found", invitation_id)
+                raise HTTPException(status_code=404, detail="error.invitation.notFound")
+            if row.owner_id != current_user.id:
+                logger.error("cancel_invitation: User %s is not authorized to cancel invitation for company %s", current_user.id, row.company_id)
+                raise HTTPException(status_code=403, detail="error.invitation.notAuthorizedCancel")
+            logger.error("cancel_invitation: Invitation %s is not pending", invitation_id)
+            raise HTTPException(status_code=400, detail="error.invitation.notPending")
         await self.db.commit()
-        await self.db.refresh(invitation)
         logger.info("cancel_invitation: Invitation %s cancelled", invitation_id)
         return invitation
 
-    async def accept_invitation(self, invitation_id: int, current_user: User) -> CompanyInvitation:
+    async def accept_invitation(self, invitation_id: int, current_user: Principal) -> CompanyInvitation:
         logger.info("accept_invitation: User %s requests to accept invitation %s", current_user.id, invitation_id)
-        result = await self.db.execute(select(CompanyInvitation).filter(CompanyInvitation.id == invitation_id))
-        invitation = result.scalars().first()
-        if not invitation:
-            logger.error("accept_invitation: Invitation %s not found", invitation_id)
-            raise HTTPException(status_code=404, detail="error.invitation.notFound")
-        if invitation.invited_user_id != current_user.id:
-            logger.error("accept_invitation: User %s is not authorized to accept invitation %s", current_user.id, invitation_id)
-            raise HTTPException(status_code=403, detail="error.invitation.notAuthorizedAccept")
-        if invitation.status != InvitationStatus.pending:
-            logger.error("accept_invitation: Invitation %s is not pending", invitation_id)
-            raise HTTPException(status_code=400, detail="error.invitation.notPending")
-        result_member = await self.db.execute(
-            select(CompanyMember).filter(
-                CompanyMember.company_id == invitation.company_id,
-                CompanyMember.user_id == current_user.id
-            )
+        invitation = await self._transition(
+            CompanyInvitation, invitation_id, InvitationStatus.pending, InvitationStatus.accepted,
+            CompanyInvitation.invited_user_id == current_user.id,
         )
-        if not result_member.scalars().first():
-            member = CompanyMember(company_id=invitation.company_id, user_id=current_user.id)
-            self.db.add(member)
+        if not invitation:
+            await self._raise_invitation_error("accept_invitation", invitation_id, current_user, "error.invitation.notAuthorizedAccept")
+        member_added = await self._add_member(invitation.company_id, current_user.id)
+        if member_added:
             logger.info("accept_invitation: Added user %s as member to company %s", current_user.id, invitation.company_id)
-        invitation.status = InvitationStatus.accepted
         await self.db.commit()
-        await self.db.refresh(invitation)
+        if member_added:
+            await CounterService.adjust(company_members_total_key(invitation.company_id), 1)
         logger.info("accept_invitation: Invitation %s accepted", invitation_id)
         return invitation
 
-    async def decline_invitation(self, invitation_id: int, current_user: User) -> CompanyInvitation:
+    async def decline_invitation(self, invitation_id: int, current_user: Principal) -> CompanyInvitation:
         logger.info("decline_invitation: User %s requests to decline invitation %s", current_user.id, invitation_id)
-        result = await self.db.execute(select(CompanyInvitation).filter(CompanyInvitation.id == invitation_id))
-        invitation = result.scalars().first()
+        invitation = await self._transition(
+            CompanyInvitation, invitation_id, InvitationStatus.pending, InvitationStatus.declined,
+            CompanyInvitation.invited_user_id == current_user.id,
+        )
         if not invitation:
-            logger.error("decline_invitation: Invitation %s not found", invitation_id)
-            raise HTTPException(status_code=404, detail="error.invitation.notFound")
-        if invitation.invited_user_id != current_user.id:
-            logger.error("decline_invitation: User %s is not authorized to decline invitation %s", current_user.id, invitation_id)
-            raise HTTPException(status_code=403, detail="error.invitation.notAuthorizedDecline")
-        if invitation.status != InvitationStatus.pending:
-            logger.error("decline_invitation: Invitation %s is not pending", invitation_id)
-            raise HTTPException(status_code=400, detail="error.invitation.notPending")
-        invitation.status = InvitationStatus.declined
+            await self._raise_invitation_error("decline_invitation", invitation_id, current_user, "error.invitation.notAuthorizedDecline")
         await self.db.commit()
-        await self.db.refresh(invitation)
         logger.info("decline_invitation: Invitation %s declined", invitation_id)
         return invitation
 
     # 2. Запит на членство
-    async def request_membership(self, company_id: int, current_user: User) -> CompanyMembershipRequest:
+    async def request_membership(self, company_id: int, current_user: Principal) -> CompanyMembershipRequest:
         logger.info("request_membership: User %s requests membership for company %s", current_user.id, company_id)
-        result = await self.db.execute(select(Company).filter(Company.id == company_id))
-        company = result.scalars().first()
+        is_member = select(CompanyMember.id).where(
+            CompanyMember.company_id == company_id, CompanyMember.user_id == current_user.id
+        ).exists()
+        result = await self.db.execute(select(Company.owner_id, is_member).filter(Company.id == company_id))
+        company = result.first()
         if not company:
             logger.error("request_membership: Company %s not found", company_id)
             raise HTTPException(status_code=404, detail="error.company.notFound")
-        if company.owner_id == current_user.id:
+        owner_id, already_member = company
+        if owner_id == current_user.id:
             logger.error("request_membership: User %s is owner of company %s and cannot request membership", current_user.id, company_id)
             raise HTTPException(status_code=400, detail="error.membership.companyOwnerIsMember")
-        result_member = await self.db.execute(
-            select(CompanyMember).filter(
-                CompanyMember.company_id == company_id,
-                CompanyMember.user_id == current_user.id
-            )
-        )
-        if result_member.scalars().first():
+        if already_member:
             logger.error("request_membership: User %s is already a member of company %s", current_user.id, company_id)
             raise HTTPException(status_code=400, detail="error.membership.alreadyMember")
-        existing = await self.db.execute(
-            select(CompanyMembershipRequest).filter(
-                CompanyMembershipRequest.company_id == company_id,
-                CompanyMembershipRequest.user_id == current_user.id,
-                CompanyMembershipRequest.status == MembershipRequestStatus.pending
+        # Дублікат відсікає частковий унікальний індекс на pending-запитах
+        result = await self.db.execute(
+            insert_for(self.db, CompanyMembershipRequest)
+            .values(company_id=company_id, user_id=current_user.id, status=MembershipRequestStatus.pending)
+            .on_conflict_do_nothing(
+                index_elements=[CompanyMembershipRequest.company_id, CompanyMembershipRequest.user_id],
+                index_where=PENDING_ONLY,
             )
+            .returning(CompanyMembershipRequest)
         )
-        if existing.scalars().first():
+        membership_request = result.scalars().first()
+        if not membership_request:
             logger.error("request_membership: Membership request already exists for user %s in company %s", current_user.id, company_id)
             raise HTTPException(status_code=400, detail="error.membership.alreadyRequested")
-        membership_request = CompanyMembershipRequest(
-            company_id=company_id,
-            user_id=current_user.id,
-            status=MembershipRequestStatus.pending
-        )
-        self.db.add(membership_request)
         await self.db.commit()
-        await self.db.refresh(membership_request)
         logger.info("request_membership: Membership request created with id %s", membership_request.id)
         return membership_request
 
-    async def cancel_membership_request(self, request_id: int, current_user: User) -> CompanyMembershipRequest:
+    async def cancel_membership_request(self, request_id: int, current_user: Principal) -> CompanyMembershipRequest:
         logger.info("cancel_membership_request: User %s requests cancellation of membership request %s", current_user.id, request_id)
-        result = await self.db.execute(
-            select(CompanyMembershipRequest).filter(CompanyMembershipRequest.id == request_id)
+        membership_request = await self._transition(
+            CompanyMembershipRequest, request_id, MembershipRequestStatus.pending, MembershipRequestStatus.cancelled,
+            CompanyMembershipRequest.user_id == current_user.id,
         )
-        membership_request = result.scalars().first()
         if not membership_request:
-            logger.error("cancel_membership_request: Membership request %s not found", request_id)
-            raise HTTPException(status_code=404, detail="error.membership.notFound")
-        if membership_request.user_id != current_user.id:
-            logger.error("cancel_membership_request: User %s is not authorized to cancel membership request %s", current_user.id, request_id)
-            raise HTTPException(status_code=403, detail="error.membership.notAuthorizedCancel")
-        if membership_request.status != MembershipRequestStatus.pending:
+            row = await self._membership_request_state(request_id)
+            if not row:
+                logger.error("cancel_membership_request: Membership request %s not found", request_id)
+                raise HTTPException(status_code=404, detail="error.membership.notFound")
+            if row.user_id != current_user.id:
+                logger.error("cancel_membership_request: User %s is not authorized to cancel membership request %s", current_user.id, request_id)
+                raise HTTPException(status_code=403, detail="error.membership.notAuthorizedCancel")
             logger.error("cancel_membership_request: Cannot cancel non-pending membership request %s", request_id)
             raise HTTPException(status_code=400, detail="error.membership.cannotCancelNonPending")
-        membership_request.status = MembershipRequestStatus.cancelled
         await self.db.commit()
-        await self.db.refresh(membership_request)
         logger.info("cancel_membership_request: Membership request %s cancelled", request_id)
         return membership_request
 
-    async def handle_membership_request(self, request_id: int, action: str, current_user: User) -> CompanyMembershipRequest:
+    async def handle_membership_request(self, request_id: int, action: str, current_user: Principal) -> CompanyMembershipRequest:
         logger.info("handle_membership_request: User %s handles membership request %s with action '%s'", current_user.id, request_id, action)
-        result = await self.db.execute(
-            select(CompanyMembershipRequest).filter(CompanyMembershipRequest.id == request_id)
+        statuses = {"accept": MembershipRequestStatus.accepted, "decline": MembershipRequestStatus.declined}
+        if action not in statuses:
+            logger.error("handle_membership_request: Invalid action '%s'", action)
+            raise HTTPException(status_code=400, detail="error.membership.invalidAction")
+        membership_request = await self._transition(
+            CompanyMembershipRequest, request_id, MembershipRequestStatus.pending, statuses[action],
+            self._owns_company(CompanyMembershipRequest.company_id, current_user),
         )
-        membership_request = result.scalars().first()
         if not membership_request:
-            logger.error("handle_membership_request: Membership request %s not found", request_id)
-            raise HTTPException(status_code=404, detail="error.membership.notFound")
-        if membership_request.company_id is None:
-            logger.error("handle_membership_request: Membership request %s has null company_id", request_id)
-            raise HTTPException(status_code=500, detail="error.membership.internalErrorNullCompanyId")
-        result_company = await self.db.execute(select(Company).filter(Company.id == membership_request.company_id))
-        company = result_company.scalars().first()
-        if not company:
-            logger.error("handle_membership_request: Company with id %s not found", membership_request.company_id)
-            raise HTTPException(status_code=404, detail="error.company.notFound")
-        if company.owner_id != current_user.id:
-            logger.error("handle_membership_request: User %s is not authorized to handle requests for company %s", current_user.id, membership_request.company_id)
-            raise HTTPException(status_code=403, detail="error.membership.notAuthorizedHandle")
-        if membership_request.status != MembershipRequestStatus.pending:
+            row = await self._membership_request_state(request_id)
+            if not row:
+                logger.error("handle_membership_request: Membership request %s not found", request_id)
+                raise HTTPException(status_code=404, detail="error.membership.notFound")
+            if row.owner_id is None:
+                logger.error("handle_membership_request: Company with id %s not found", row.company_id)
+                raise HTTPException(status_code=404, detail="error.company.notFound")
+            if row.owner_id != current_user.id:
+                logger.error("handle_membership_request: User %s is not authorized to handle requests for company %s", current_user.id, row.company_id)
+                raise HTTPException(status_code=403, detail="error.membership.notAuthorizedHandle")
             logger.error("handle_membership_request: Membership request %s is not pending", request_id)
             raise HTTPException(status_code=400, detail="error.membership.notPending")
+        member_added = False
         if action == "accept":
-            result_member = await self.db.execute(
-                select(CompanyMember).filter(
-                    CompanyMember.company_id == membership_request.company_id,
-                    CompanyMember.user_id == membership_request.user_id
-                )
-            )
-            if not result_member.scalars().first():
-                member = CompanyMember(company_id=membership_request.company_id, user_id=membership_request.user_id)
-                self.db.add(member)
+            member_added = await self._add_member(membership_request.company_id, membership_request.user_id)
+            if member_added:
                 logger.info("handle_membership_request: Added user %s as member to company %s", membership_request.user_id, membership_request.company_id)
-            membership_request.status = MembershipRequestStatus.accepted
-        elif action == "decline":
-            membership_request.status = MembershipRequestStatus.declined
-        else:
-            logger.error("handle_membership_request: Invalid action '%s'", action)
-            raise HTTPException(status_code=400, detail="error.membership.invalidAction")
         await self.db.commit()
-        await self.db.refresh(membership_request)
+        if member_added:
+            await CounterService.adjust(company_members_total_key(membership_request.company_id), 1)
         logger.info("handle_membership_request: Membership request %s handled with status %s", request_id, membership_request.status)
         return membership_request
 
+    async def handle_membership_requests(
+        self, company_id: int, action: str, request_ids: Optional[list[int]], current_user: Principal
+    ) -> BulkMembershipRequestResponse:
+        # request_ids=None означає всі pending-запити компанії
+        logger.info("handle_membership_requests: User %s handles %s membership requests of company %s with action '%s'",
+                    current_user.id, "all pending" if request_ids is None else len(request_ids), company_id, action)
+        statuses = {"accept": MembershipRequestStatus.accepted, "decline": MembershipRequestStatus.declined}
+        if action not in statuses:
+            logger.error("handle_membership_requests: Invalid action '%s'", action)
+            raise HTTPException(status_code=400, detail="error.membership.invalidAction")
+        result = await self.db.execute(select(Company.owner_id).filter(Company.id == company_id))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            logger.error("handle_membership_requests: Company %s not found", company_id)
+            raise HTTPException(status_code=404, detail="error.company.notFound")
+        if owner_id != current_user.id:
+            logger.error("handle_membership_requests: User %s is not authorized to handle requests for company %s", current_user.id, company_id)
+            raise HTTPException(status_code=403, detail="error.membership.notAuthorizedHandle")
+
+        stmt = (
+            update(CompanyMembershipRequest)
+            .where(
+                CompanyMembershipRequest.company_id == company_id,
+                CompanyMembershipRequest.status == MembershipRequestStatus.pending,
+            )
+            .values(status=statuses[action])
+            .returning(CompanyMembershipRequest.id)
+            .execution_options(synchronize_session=False)
+        )
+        if request_ids is not None:
+            stmt = stmt.where(CompanyMembershipRequest.id.in_(request_ids))
+        handled_ids = (await self.db.execute(stmt)).scalars().all()
+
+        members_added = 0
+        if action == "accept" and handled_ids:
+            # Учасників додаємо тим самим транзакційним INSERT ... SELECT з прийнятих запитів
+            result = await self.db.execute(
+                insert_for(self.db, CompanyMember)
+                .from_select(
+                    ["company_id", "user_id"],
+                    select(literal(company_id), CompanyMembershipRequest.user_id).where(
+                        CompanyMembershipRequest.id.in_(handled_ids)
+                    ),
+                )
+                .on_conflict_do_nothing(index_elements=[CompanyMember.company_id, CompanyMember.user_id])
+                .returning(CompanyMember.id)
+            )
+            members_added = len(result.all())
+        await self.db.commit()
+        if members_added:
+            await CounterService.adjust(company_members_total_key(company_id), members_added)
+
+        failed = []
+        failed_ids = [] if request_ids is None else sorted(set(request_ids) - set(handled_ids))
+        if failed_ids:
+            result = await self.db.execute(
+                select(CompanyMembershipRequest.id).filter(
+                    CompanyMembershipRequest.id.in_(failed_ids),
+                    CompanyMembershipRequest.company_id == company_id,
+                )
+            )
+            existing = set(result.scalars().all())
+            failed = [
+                BulkMembershipRequestFailure(
+                    request_id=request_id,
+                    error="error.membership.notPending" if request_id in existing else "error.membership.notFound",
+                )
+                for request_id in failed_ids
+            ]
+        logger.info("handle_membership_requests: Handled %s requests of company %s, added %s members, %s failed",
+                    len(handled_ids), company_id, members_added, len(failed))
+        return BulkMembershipRequestResponse(processed=len(handled_ids), members_added=members_added, failed=failed)
+
+    # Перехід стану одним UPDATE ... RETURNING: статус і права перевіряються в WHERE,
+    # тому з двох паралельних переходів проходить лише один
+    async def _transition(self, model, row_id: int, from_status, to_status, authorized):
+        result = await self.db.execute(
+            update(model)
+            .where(model.id == row_id, model.status == from_status, authorized)
+            .values(status=to_status)
+            .returning(model)
+        )
+        return result.scalars().first()
+
+    async def _add_member(self, company_id: int, user_id: int) -> bool:
+        # Якщо користувач уже учасник, унікальний індекс просто пропускає вставку
+        result = await self.db.execute(
+            insert_for(self.db, CompanyMember)
+            .values(company_id=company_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[CompanyMember.company_id, CompanyMember.user_id])
+            .returning(CompanyMember.id)
+        )
+        return result.first() is not None
+
+    @staticmethod
+    def _owns_company(company_id_column, current_user: Principal):
+        return select(Company.id).where(Company.id == company_id_column, Company.owner_id == current_user.id).exists()
+
+    # Запити нижче виконуються лише після невдалого переходу, щоб обрати помилку
+    async def _invitation_state(self, invitation_id: int):
+        result = await self.db.execute(
+            select(CompanyInvitation.company_id, CompanyInvitation.invited_user_id, CompanyInvitation.status, Company.owner_id)
+            .outerjoin(Company, Company.id == CompanyInvitation.company_id)
+            .filter(CompanyInvitation.id == invitation_id)
+        )
+        return result.first()
+
+    async def _membership_request_state(self, request_id: int):
+        result = await self.db.execute(
+            select(CompanyMembershipRequest.company_id, CompanyMembershipRequest.user_id, CompanyMembershipRequest.status, Company.owner_id)
+            .outerjoin(Company, Company.id == CompanyMembershipRequest.company_id)
+            .filter(CompanyMembershipRequest.id == request_id)
+        )
+        return result.first()
+
+    async def _raise_invitation_error(self, operation: str, invitation_id: int, current_user: Principal, forbidden_key: str):
+        row = await self._invitation_state(invitation_id)
+        if not row:
+            logger.error("%s: Invitation %s not found", operation, invitation_id)
+            raise HTTPException(status_code=404, detail="error.invitation.notFound")
+        if row.invited_user_id != current_user.id:
+            logger.error("%s: User %s is not authorized for invitation %s", operation, current_user.id, invitation_id)
+            raise HTTPException(status_code=403, detail=forbidden_key)
+        logger.error("%s: Invitation %s is not pending", operation, invitation_id)
+        raise HTTPException(status_code=400, detail="error.invitation.notPending")
+
     # 3. Управління учасниками
-    async def remove_member(self, company_id: int, member_user_id: int, current_user: User) -> dict:
+    async def remove_member(self, company_id: int, member_user_id: int, current_user: Principal) -> dict:
         logger.info("remove_member: User %s requests to remove member %s from company %s", current_user.id, member_user_id, company_id)
         result = await self.db.execute(select(Company).filter(Company.id == company_id))
         company = result.scalars().first()
@@ -255,10 +432,11 @@ class CompanyActionsService:
             raise HTTPException(status_code=404, detail="error.member.notFound")
         await self.db.delete(member)
         await self.db.commit()
+        await CounterService.adjust(company_members_total_key(company_id), -1)
         logger.info("remove_member: Member %s removed from company %s", member_user_id, company_id)
         return {"detail": "Member removed successfully"}
 
-    async def leave_company(self, company_id: int, current_user: User) -> dict:
+    async def leave_company(self, company_id: int, current_user: Principal) -> dict:
         logger.info("leave_company: User %s requests to leave company %s", current_user.id, company_id)
         result_member = await self.db.execute(
             select(CompanyMember).filter(
@@ -272,31 +450,36 @@ class CompanyActionsService:
             raise HTTPException(status_code=404, detail="error.member.notAMember")
         await self.db.delete(member)
         await self.db.commit()
+        await CounterService.adjust(company_members_total_key(company_id), -1)
         logger.info("leave_company: User %s has left company %s", current_user.id, company_id)
         return {"detail": "You have left the company"}
 
-    async def get_invitations_for_user(self, current_user: User) -> list[CompanyInvitation]:
-        logger.info("get_invitations_for_user: Fetching invitations for user %s", current_user.id)
-        result = await self.db.execute(
-            select(CompanyInvitation).filter(CompanyInvitation.invited_user_id == current_user.id)
-        )
-        invitations = result.scalars().all()
+    async def get_invitations_for_user(self, current_user: Principal, status: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[CompanyInvitation], Optional[str]]:
+        logger.info("get_invitations_for_user: Fetching invitations for user %s with status=%s, limit=%s and cursor=%s", current_user.id, status, limit, cursor)
+        query = select(CompanyInvitation).filter(CompanyInvitation.invited_user_id == current_user.id)
+        if status is not None:
+            query = query.filter(CompanyInvitation.status == InvitationStatus(status))
+        result = await self.db.execute(paginate(query, CompanyInvitation.id, limit=limit, cursor=cursor))
+        invitations, next_cursor = split_page(result.scalars().all(), limit)
         logger.info("get_invitations_for_user: Found %s invitations", len(invitations))
-        return invitations
+        return invitations, next_cursor
 
-    async def get_membership_requests_for_user(self, current_user: User) -> list[CompanyMembershipRequest]:
-        logger.info("get_membership_requests_for_user: Fetching membership requests for user %s", current_user.id)
-        result = await self.db.execute(
+    async def get_membership_requests_for_user(self, current_user: Principal, status: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[CompanyMembershipRequest], Optional[str]]:
+        logger.info("get_membership_requests_for_user: Fetching membership requests for user %s with status=%s, limit=%s and cursor=%s", current_user.id, status, limit, cursor)
+        query = (
             select(CompanyMembershipRequest)
             .filter(CompanyMembershipRequest.user_id == current_user.id)
             .options(selectinload(CompanyMembershipRequest.company))
         )
-        requests = result.scalars().all()
+        if status is not None:
+            query = query.filter(CompanyMembershipRequest.status == MembershipRequestStatus(status))
+        result = await self.db.execute(paginate(query, CompanyMembershipRequest.id, limit=limit, cursor=cursor))
+        requests, next_cursor = split_page(result.scalars().all(), limit)
         logger.info("get_membership_requests_for_user: Found %s membership requests", len(requests))
-        return requests
+        return requests, next_cursor
 
-    async def get_invitations_for_company(self, company_id: int, current_user: User) -> list[CompanyInvitation]:
-        logger.info("get_invitations_for_company: User %s requests invitations for company %s", current_user.id, company_id)
+    async def get_invitations_for_company(self, company_id: int, current_user: Principal, status: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[CompanyInvitation], Optional[str]]:
+        logger.info("get_invitations_for_company: User %s requests invitations for company %s with status=%s, limit=%s and cursor=%s", current_user.id, company_id, status, limit, cursor)
         result = await self.db.execute(select(Company).filter(Company.id == company_id))
         company = result.scalars().first()
         if not company:
@@ -305,15 +488,16 @@ class CompanyActionsService:
         if company.owner_id != current_user.id:
             logger.error("get_invitations_for_company: User %s is not authorized to view invitations for company %s", current_user.id, company_id)
             raise HTTPException(status_code=403, detail="error.forbidden")
-        result_inv = await self.db.execute(
-            select(CompanyInvitation).filter(CompanyInvitation.company_id == company_id)
-        )
-        invitations = result_inv.scalars().all()
+        query = select(CompanyInvitation).filter(CompanyInvitation.company_id == company_id)
+        if status is not None:
+            query = query.filter(CompanyInvitation.status == InvitationStatus(status))
+        result_inv = await self.db.execute(paginate(query, CompanyInvitation.id, limit=limit, cursor=cursor))
+        invitations, next_cursor = split_page(result_inv.scalars().all(), limit)
         logger.info("get_invitations_for_company: Found %s invitations for company %s", len(invitations), company_id)
-        return invitations
+        return invitations, next_cursor
 
-    async def get_membership_requests_for_company(self, company_id: int, current_user: User) -> list[CompanyMembershipRequest]:
-        logger.info("get_membership_requests_for_company: User %s requests membership requests for company %s", current_user.id, company_id)
+    async def get_membership_requests_for_company(self, company_id: int, current_user: Principal, status: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[CompanyMembershipRequest], Optional[str]]:
+        logger.info("get_membership_requests_for_company: User %s requests membership requests for company %s with status=%s, limit=%s and cursor=%s", current_user.id, company_id, status, limit, cursor)
         result = await self.db.execute(select(Company).filter(Company.id == company_id))
         company = result.scalars().first()
         if not company:
@@ -322,27 +506,41 @@ class CompanyActionsService:
         if company.owner_id != current_user.id:
             logger.error("get_membership_requests_for_company: User %s is not authorized to view membership requests for company %s", current_user.id, company_id)
             raise HTTPException(status_code=403, detail="error.forbidden")
-        result_req = await self.db.execute(
-            select(CompanyMembershipRequest).filter(CompanyMembershipRequest.company_id == company_id)
-        )
-        requests = result_req.scalars().all()
+        query = select(CompanyMembershipRequest).filter(CompanyMembershipRequest.company_id == company_id)
+        if status is not None:
+            query = query.filter(CompanyMembershipRequest.status == MembershipRequestStatus(status))
+        result_req = await self.db.execute(paginate(query, CompanyMembershipRequest.id, limit=limit, cursor=cursor))
+        requests, next_cursor = split_page(result_req.scalars().all(), limit)
         logger.info("get_membership_requests_for_company: Found %s membership requests for company %s", len(requests), company_id)
-        return requests
+        return requests, next_cursor
 
-    async def get_company_members(self, company_id: int, skip: int = 0, limit: int = 10) -> tuple[list[CompanyMember], int]:
-        logger.info("get_company_members: Fetching members for company %s with skip=%s and limit=%s", company_id, skip, limit)
+    async def get_company_members(self, company_id: int, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, include_user: bool = False) -> tuple[list[CompanyMember], int, Optional[str]]:
+        logger.info("get_company_members: Fetching members for company %s with skip=%s, limit=%s, cursor=%s and include_user=%s", company_id, skip, limit, cursor, include_user)
+        query = select(CompanyMember).filter(CompanyMember.company_id == company_id)
+        if include_user:
+            # Один додатковий SELECT ... WHERE id IN (...) лише з потрібними колонками;
+            # друзі та інші зв'язки користувача не завантажуються
+            query = query.options(
+                selectinload(CompanyMember.user).options(
+                    load_only(User.id, User.name, User.profile_picture), raiseload("*")
+                )
+            )
         result = await self.db.execute(
-            select(CompanyMember).filter(CompanyMember.company_id == company_id).offset(skip).limit(limit)
+            paginate(query, CompanyMember.id, skip=skip, limit=limit, cursor=cursor)
         )
-        members = result.scalars().all()
-        result_total = await self.db.execute(
-            select(CompanyMember).filter(CompanyMember.company_id == company_id)
+        members, next_cursor = split_page(result.scalars().all(), limit)
+        total = await CounterService(self.db).total(
+            company_members_total_key(company_id), select(CompanyMember).filter(CompanyMember.company_id == company_id)
         )
-        total = len(result_total.scalars().all())
         logger.info("get_company_members: Found %s members (total %s) for company %s", len(members), total, company_id)
-        return members, total
+        return members, total, next_cursor
+
+    def stream_company_members(self, company_id: int) -> AsyncIterator[str]:
+        logger.info("stream_company_members: Streaming members for company %s", company_id)
+        query = select(CompanyMember).filter(CompanyMember.company_id == company_id).order_by(CompanyMember.id)
+        return ndjson_rows(self.db, query, CompanyMemberResponse)
 
-    async def get_companies_where_user_is_member(self, current_user: User) -> list:
+    async def get_companies_where_user_is_member(self, current_user: Principal) -> list:
         logger.info("get_companies_where_user_is_member: Fetching companies for user %s", current_user.id)
         result = await self.db.execute(
             select(Company)
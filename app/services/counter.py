@@ -0,0 +1,119 @@
+from typing import Optional
+from redis.exceptions import RedisError
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import cache_settings
+from app.core.logger import logger
+from app.db.redis import redis_client
+
+USERS_TOTAL_KEY = "count:users"
+COMPANIES_TOTAL_KEY = "count:companies"
+
+# Змінюємо лічильник лише якщо він уже є в кеші, інакше наступне читання
+# порахує його заново з бази
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def owned_companies_total_key(owner_id: int) -> str:
+    return f"count:companies:owner:{owner_id}"
+
+
+def company_members_total_key(company_id: int) -> str:
+    return f"count:company_members:{company_id}"
+
+
+class CounterService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def count(self, query: Select) -> int:
+        count_query = select(func.count()).select_from(
+            query.order_by(None).limit(None).offset(None).subquery()
+        )
+        result = await self.db.execute(count_query)
+        return result.scalar_one()
+
+    async def estimate(self, table_name: str) -> Optional[int]:
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+        result = await self.db.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table_name)"
+            ),
+            {"table_name": table_name},
+        )
+        estimate = result.scalar()
+        # reltuples = -1, поки таблицю жодного разу не аналізували
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    async def total(
+        self, key: str, query: Select, table_name: Optional[str] = None
+    ) -> int:
+        cached = await self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        total = None
+        if table_name is not None:
+            estimate = await self.estimate(table_name)
+            if (
+                estimate is not None
+                and estimate >= cache_settings.APPROXIMATE_COUNT_THRESHOLD
+            ):
+                total = estimate
+        if total is None:
+            total = await self.count(query)
+
+        # Лічильник з репліки може відставати, а adjust() рознесе похибку
+        # всім воркерам, тож у спільний кеш пишемо лише підрахунок з основної БД
+        if not self.db.info.get("replica"):
+            await self._set_cached(key, total)
+        return total
+
+    @staticmethod
+    async def adjust(key: str, delta: int) -> None:
+        if not cache_settings.CACHE_ENABLED:
+            return
+        try:
+            await redis_client.eval(_INCR_IF_EXISTS, 1, key, delta)
+        except RedisError as e:
+            logger.warning("Failed to adjust counter %s: %s", key, e)
+
+    @staticmethod
+    async def invalidate(*keys: str) -> None:
+        if not cache_settings.CACHE_ENABLED or not keys:
+            return
+        try:
+            await redis_client.delete(*keys)
+        except RedisError as e:
+            logger.warning("Failed to invalidate counters %s: %s", keys, e)
+
+    @staticmethod
+    async def _get_cached(key: str) -> Optional[int]:
+        if not cache_settings.CACHE_ENABLED:
+            return None
+        try:
+            value = await redis_client.get(key)
+        except RedisError as e:
+            logger.warning("Failed to read counter %s: %s", key, e)
+            return None
+        return int(value) if value is not None else None
+
+    @staticmethod
+    async def _set_cached(key: str, total: int) -> None:
+        if not cache_settings.CACHE_ENABLED:
+            return
+        try:
+            await redis_client.set(key, total, ex=cache_settings.COUNT_CACHE_TTL)
+        except RedisError as e:
+            logger.warning("Failed to cache counter %s: %s", key, e)
@@ -0,0 +1,168 @@
+import asyncio
+import random
+import time
+from typing import Optional
+import httpx
+from fastapi import HTTPException
+
+from app.core.config import auth0_settings
+from app.core.logger import logger
+
+
+class CircuitBreaker:
+    """Після failure_threshold послідовних збоїв розмикається на reset_timeout.
+
+    Поки ланцюг розімкнений, виклики одразу відхиляються; після тайм-ауту
+    пропускається одна пробна спроба, і її результат замикає або знову
+    розмикає ланцюг.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        # Пробу, що зависла або була скасована, дозволяємо повторити
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_started = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class Auth0Client:
+    """Спільний httpx.AsyncClient з пулом keep-alive з'єднань до Auth0.
+
+    Створюється в lifespan; мережеві збої та 5xx повторюються з експоненційною
+    затримкою і jitter, а при недоступності Auth0 запити одразу отримують 503.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        retries: int,
+        backoff: float,
+        breaker: CircuitBreaker,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        # Фонові задачі й тести можуть звертатись до Auth0 поза lifespan
+        await self.start()
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+        # Пробу в half-open пропускаємо один раз на логічний виклик, а збій
+        # рахуємо лише після вичерпання повторів
+        if not self.breaker.allow():
+            logger.warning("Auth0 circuit is open, rejecting %s %s", method, url)
+            raise HTTPException(status_code=503, detail="error.auth.auth0Unavailable")
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.request(
+                    method, url, timeout=timeout, **kwargs
+                )
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                error = f"HTTP {response.status_code}"
+                if attempt >= retries:
+                    self.breaker.record_failure()
+                    return response
+
+            if attempt >= retries:
+                self.breaker.record_failure()
+                logger.error("Auth0 %s %s failed: %s", method, url, error)
+                raise HTTPException(status_code=503, detail="error.auth.auth0Unavailable")
+            # Full jitter, щоб воркери не повторювали запити синхронно
+            delay = random.uniform(0, self.backoff * 2**attempt)
+            logger.warning(
+                "Auth0 %s %s failed (%s), retrying in %.2fs", method, url, error, delay
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+
+auth0_client = Auth0Client(
+    base_url=f"https://{auth0_settings.AUTH0_DOMAIN}",
+    timeout=auth0_settings.AUTH0_HTTP_TIMEOUT,
+    max_connections=auth0_settings.AUTH0_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=auth0_settings.AUTH0_HTTP_MAX_KEEPALIVE,
+    retries=auth0_settings.AUTH0_HTTP_RETRIES,
+    backoff=auth0_settings.AUTH0_HTTP_BACKOFF,
+    breaker=CircuitBreaker(
+        failure_threshold=auth0_settings.AUTH0_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=auth0_settings.AUTH0_CIRCUIT_RESET_TIMEOUT,
+    ),
+)
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+from redis.exceptions import RedisError
+
+from app.core.config import job_queue_settings
+from app.core.logger import logger
+from app.db.redis import redis_client
+
+# Переносимо задачі, час повтору яких настав, назад у чергу
+_PROMOTE_DELAYED = """
+local jobs = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, job in ipairs(jobs) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('LPUSH', KEYS[2], job)
+end
+return #jobs
+"""
+
+# Повертаємо незавершені задачі споживача, якщо його heartbeat зник
+_RECOVER_CONSUMER = """
+if ARGV[2] == '0' and redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+local count = 0
+while redis.call('RPOPLPUSH', KEYS[2], KEYS[3]) do
+    count = count + 1
+end
+redis.call('SREM', KEYS[4], ARGV[1])
+redis.call('DEL', KEYS[1])
+return count
+"""
+
+
+class JobQueue:
+    """Надійна черга фонових задач у Redis зі споживачами в цьому ж процесі.
+
+    Взята в роботу задача лежить у списку processing цього процесу, доки
+    обробник не завершиться, тож після падіння воркера її підхоплюють інші.
+    Невдалі задачі повторюються з експоненційною затримкою, а після
+    max_attempts потрапляють у dead-letter список.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        consumers: int,
+        max_attempts: int,
+        retry_backoff: float,
+        drain_timeout: float,
+        heartbeat_ttl: int,
+        poll_timeout: int,
+    ):
+        self.name = name
+        self.consumers = consumers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.drain_timeout = drain_timeout
+        self.heartbeat_ttl = heartbeat_ttl
+        self.poll_timeout = poll_timeout
+        self.consumer_id = uuid.uuid4().hex
+        self.queue_key = f"jobs:{name}"
+        self.delayed_key = f"jobs:{name}:delayed"
+        self.dead_key = f"jobs:{name}:dead"
+        self.consumers_key = f"jobs:{name}:consumers"
+        self._handlers: dict[str, Callable[[Any], Awaitable[None]]] = {}
+        self._consumers: list[asyncio.Task] = []
+        self._maintainer: Optional[asyncio.Task] = None
+        self._inline: set[asyncio.Task] = set()
+        self._stopping = False
+        self.metrics = {
+            "enqueued": 0,
+            "inline": 0,
+            "processed": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "recovered": 0,
+        }
+
+    def processing_key(self, consumer_id: str) -> str:
+        return f"jobs:{self.name}:processing:{consumer_id}"
+
+    def heartbeat_key(self, consumer_id: str) -> str:
+        return f"jobs:{self.name}:heartbeat:{consumer_id}"
+
+    def register(self, job_name: str, handler: Callable[[Any], Awaitable[None]]) -> None:
+        self._handlers[job_name] = handler
+
+    async def enqueue(self, job_name: str, payload: Any) -> None:
+        job = {"id": uuid.uuid4().hex, "name": job_name, "payload": payload, "attempts": 0}
+        try:
+            await redis_client.lpush(self.queue_key, json.dumps(job))
+            self.metrics["enqueued"] += 1
+        except RedisError as e:
+            # Без Redis виконуємо задачу тут же, але не губимо її при зупинці
+            logger.warning("Job %s not enqueued, running inline: %s", job_name, e)
+            self.metrics["inline"] += 1
+            task = asyncio.create_task(self._run_inline(job_name, payload))
+            self._inline.add(task)
+            task.add_done_callback(self._inline.discard)
+
+    async def start(self) -> None:
+        self._stopping = False
+        await self._maintain_once()
+        self._consumers = [
+            asyncio.create_task(self._consume()) for _ in range(self.consumers)
+        ]
+        self._maintainer = asyncio.create_task(self._maintain())
+
+    async def stop(self) -> None:
+        # Нові задачі більше не беремо, поточним даємо drain_timeout на завершення
+        self._stopping = True
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+        running = [*self._consumers, *self._inline]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+        if self._maintainer is not None:
+            await asyncio.gather(self._maintainer, return_exceptions=True)
+        self._consumers = []
+        self._maintainer = None
+        # Перервані задачі повертаємо в чергу для інших воркерів
+        await self._recover(self.consumer_id, force=True)
+
+    async def _consume(self) -> None:
+        processing_key = self.processing_key(self.consumer_id)
+        while not self._stopping:
+            try:
+                raw = await redis_client.brpoplpush(
+                    self.queue_key, processing_key, timeout=self.poll_timeout
+                )
+            except RedisError as e:
+                logger.warning("Job queue %s unavailable: %s", self.name, e)
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if raw is not None:
+                await self._process(raw)
+
+    async def _process(self, raw: str) -> None:
+        try:
+            job = json.loads(raw)
+            handler = self._handlers[job["name"]]
+        except (ValueError, KeyError, TypeError):
+            logger.error("Dropping malformed job to dead letters: %s", raw)
+            await self._finish(raw, dead_letter=raw)
+            return
+
+        try:
+            await handler(job["payload"])
+        except Exception as e:
+            job["attempts"] += 1
+            job["error"] = str(e)
+            if job["attempts"] >= self.max_attempts:
+                logger.exception("Job %s failed for good after %s attempts", job["id"], job["attempts"])
+                self.metrics["dead_lettered"] += 1
+                await self._finish(raw, dead_letter=json.dumps(job))
+            else:
+                delay = self.retry_backoff * 2 ** (job["attempts"] - 1)
+                logger.warning("Job %s failed (%s), retrying in %ss", job["id"], e, delay)
+                self.metrics["retried"] += 1
+                await self._finish(raw, retry=(json.dumps(job), time.time() + delay))
+        else:
+            self.metrics["processed"] += 1
+            await self._finish(raw)
+
+    async def _finish(
+        self,
+        raw: str,
+        retry: Optional[tuple[str, float]] = None,
+        dead_letter: Optional[str] = None,
+    ) -> None:
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.lrem(self.processing_key(self.consumer_id), 1, raw)
+                if retry is not None:
+                    job, ready_at = retry
+                    pipe.zadd(self.delayed_key, {job: ready_at})
+                if dead_letter is not None:
+                    pipe.lpush(self.dead_key, dead_letter)
+                await pipe.execute()
+        except RedisError as e:
+            # Задача лишається в processing і повернеться в чергу при зупинці
+            logger.error("Failed to settle job in %s: %s", self.name, e)
+
+    async def _run_inline(self, job_name: str, payload: Any) -> None:
+        try:
+            await self._handlers[job_name](payload)
+        except Exception:
+            logger.exception("Inline job %s failed", job_name)
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_ttl / 3)
+            await self._maintain_once()
+
+    async def _maintain_once(self) -> None:
+        try:
+            await redis_client.set(
+                self.heartbeat_key(self.consumer_id), "1", ex=self.heartbeat_ttl
+            )
+            await redis_client.sadd(self.consumers_key, self.consumer_id)
+            await redis_client.eval(
+                _PROMOTE_DELAYED, 2, self.delayed_key, self.queue_key, time.time()
+            )
+            for consumer_id in await redis_client.smembers(self.consumers_key):
+                if consumer_id != self.consumer_id:
+                    await self._recover(consumer_id)
+        except RedisError as e:
+            logger.warning("Job queue %s maintenance failed: %s", self.name, e)
+
+    async def _recover(self, consumer_id: str, force: bool = False) -> None:
+        try:
+            recovered = await redis_client.eval(
+                _RECOVER_CONSUMER,
+                4,
+                self.heartbeat_key(consumer_id),
+                self.processing_key(consumer_id),
+                self.queue_key,
+                self.consumers_key,
+                consumer_id,
+                "1" if force else "0",
+            )
+        except RedisError as e:
+            logger.warning("Failed to recover jobs of %s: %s", consumer_id, e)
+            return
+        if recovered:
+            self.metrics["recovered"] += recovered
+            logger.info("Requeued %s unfinished jobs of consumer %s", recovered, consumer_id)
+
+
+job_queue = JobQueue(
+    name=job_queue_settings.JOB_QUEUE_NAME,
+    consumers=job_queue_settings.JOB_QUEUE_CONSUMERS,
+    max_attempts=job_queue_settings.JOB_MAX_ATTEMPTS,
+    retry_backoff=job_queue_settings.JOB_RETRY_BACKOFF,
+    drain_timeout=job_queue_settings.JOB_DRAIN_TIMEOUT,
+    heartbeat_ttl=job_queue_settings.JOB_HEARTBEAT_TTL,
+    poll_timeout=job_queue_settings.JOB_POLL_TIMEOUT,
+)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Optional
+import httpx
+from fastapi import HTTPException
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+from app.core.config import auth0_settings
+from app.core.logger import logger
+from app.services.http_client import auth0_client
+
+
+class JWKSManager:
+    """Тримає ключі Auth0 у словнику kid -> розібраний ключ.
+
+    Ключі завантажуються при першому використанні або фоновою задачею з
+    lifespan, оновлюються після TTL, а для невідомого kid — не частіше ніж
+    раз на min_refresh_interval.
+    """
+
+    def __init__(self, jwks_url: str, ttl: int, min_refresh_interval: int):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, Key] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future] = None
+
+    def find(self, kid: str) -> Optional[Key]:
+        return self._keys.get(kid)
+
+    async def get(self, kid: str) -> Optional[Key]:
+        if self._fetched_at is not None and self._is_stale() and self._may_refresh():
+            # Прострочені ключі ще валідні, оновлюємо їх без очікування
+            self._start_refresh()
+        key = self._keys.get(kid)
+        if key is None and self._refreshing is not None and not self._refreshing.done():
+            # Завантаження вже йде, і _last_attempt щойно оновлено — чекаємо на нього
+            await asyncio.shield(self._refreshing)
+            key = self._keys.get(kid)
+        if key is None and self._may_refresh():
+            logger.info("JWKS kid %s not loaded, refreshing keys", kid)
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Future:
+        # Одночасні виклики чекають на одне завантаження
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._fetch())
+        return self._refreshing
+
+    async def run_refresh_loop(self) -> None:
+        while True:
+            if self._fetched_at is None or self._is_stale():
+                await self.refresh()
+            await asyncio.sleep(
+                self.min_refresh_interval if self._fetched_at is None else self.ttl
+            )
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at >= self.ttl
+
+    def _may_refresh(self) -> bool:
+        return (
+            self._last_attempt is None
+            or time.monotonic() - self._last_attempt >= self.min_refresh_interval
+        )
+
+    async def _fetch(self) -> None:
+        self._last_attempt = time.monotonic()
+        try:
+            response = await auth0_client.get(self.jwks_url)
+            response.raise_for_status()
+            raw_keys = response.json()["keys"]
+        except (httpx.HTTPError, HTTPException, ValueError, KeyError) as e:
+            # Залишаємо попередній набір ключів, якщо він був
+            logger.error("Failed to fetch JWKS from %s: %s", self.jwks_url, e)
+            return
+
+        keys = {}
+        for raw_key in raw_keys:
+            try:
+                keys[raw_key["kid"]] = jwk.construct(
+                    raw_key, algorithm=raw_key.get("alg", "RS256")
+                )
+            except (JWKError, KeyError) as e:
+                logger.warning("Skipping unusable JWKS key %s: %s", raw_key, e)
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        logger.info("Loaded %s JWKS keys", len(keys))
+
+
+jwks_manager = JWKSManager(
+    jwks_url=auth0_settings.AUTH0_JWKS_ENDPOINT,
+    ttl=auth0_settings.AUTH0_JWKS_TTL,
+    min_refresh_interval=auth0_settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL,
+)
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.config import security_settings
+from app.core.logger import logger
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+ResultT = TypeVar("ResultT")
+
+
+class PasswordHasher:
+    """Виконує bcrypt у власному пулі потоків, не блокуючи event loop.
+
+    Кількість операцій, що чекають або виконуються, обмежена max_pending:
+    понад неї запит одразу отримує 503 замість того, щоб ставати в чергу.
+    Пул створюється при першій операції і заново після shutdown.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.metrics = {
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+            "rejected": 0,
+            "hash_count": 0,
+            "hash_seconds_total": 0.0,
+            "verify_count": 0,
+            "verify_seconds_total": 0.0,
+        }
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", pwd_context.verify, password, hashed_password)
+
+    async def _run(self, operation: str, func: Callable[..., ResultT], *args) -> ResultT:
+        if self._pending >= self.max_pending:
+            self.metrics["rejected"] += 1
+            logger.warning("Password %s rejected: %s operations pending", operation, self._pending)
+            raise HTTPException(status_code=503, detail="error.auth.tooManyRequests")
+
+        self._pending += 1
+        self.metrics["queue_depth"] = self._pending
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], self._pending)
+        started = time.perf_counter()
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            self.metrics["queue_depth"] = self._pending
+            self.metrics[f"{operation}_count"] += 1
+            self.metrics[f"{operation}_seconds_total"] += time.perf_counter() - started
+
+    async def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # Дочікуємось операцій, що виконуються, не блокуючи event loop
+            await asyncio.to_thread(executor.shutdown, True)
+
+
+password_hasher = PasswordHasher(
+    max_workers=security_settings.PASSWORD_HASH_WORKERS,
+    max_pending=security_settings.PASSWORD_HASH_MAX_PENDING,
+)
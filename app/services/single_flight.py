@@ -0,0 +1,115 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+from redis.exceptions import RedisError
+
+from app.core.config import cache_settings
+from app.core.logger import logger
+from app.db.redis import redis_client
+
+# Знімаємо лише власний лок, щоб не звільнити лок іншого воркера після TTL
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Об'єднує одночасні промахи по одному ключу в один виклик завантажувача.
+
+    У межах воркера очікувачі чекають на спільний asyncio.Future, між воркерами
+    лідера визначає короткий лок у Redis, а решта чекають, поки він заповнить кеш.
+    """
+
+    def __init__(self, lock_ttl: float, poll_interval: float):
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Лідера скасували (клієнт відʼєднався) — завантажуємо самі
+                return await self.do(key, loader, recheck)
+
+        future = asyncio.get_running_loop().create_future()
+        # Позначаємо виняток як отриманий, навіть якщо очікувачів не було
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._load(key, loader, recheck)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]],
+    ) -> Any:
+        if recheck is None or not cache_settings.CACHE_ENABLED:
+            return await loader()
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.lock_ttl * 1000)
+            )
+        except RedisError as e:
+            logger.warning("Single-flight lock failed for %s: %s", key, e)
+            return await loader()
+
+        if acquired:
+            try:
+                return await loader()
+            finally:
+                try:
+                    await redis_client.eval(_RELEASE_LOCK, 1, lock_key, token)
+                except RedisError as e:
+                    logger.warning("Single-flight unlock failed for %s: %s", key, e)
+
+        # Інший воркер уже завантажує значення — чекаємо, поки воно зʼявиться
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            value = await recheck()
+            if value is not None:
+                return value
+            try:
+                if not await redis_client.exists(lock_key):
+                    break
+            except RedisError:
+                break
+        value = await recheck()
+        if value is not None:
+            return value
+        return await loader()
+
+
+single_flight = SingleFlight(
+    lock_ttl=cache_settings.SINGLE_FLIGHT_LOCK_TTL,
+    poll_interval=cache_settings.SINGLE_FLIGHT_POLL_INTERVAL,
+)
@@ -1,41 +1,71 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, or_
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from app.db.models.user import User, Auth0User
+from app.db.models.user import User, Auth0User, friends_association
 from app.schemas.user import (
     UserDetailResponse,
     UserUpdateRequest,
     SignUpRequest,
     UsersListResponse,
 )
-from passlib.context import CryptContext
 from fastapi import HTTPException
 from app.core.logger import logger
-from typing import Dict
+from app.services.counter import (
+    CounterService,
+    USERS_TOTAL_KEY,
+    COMPANIES_TOTAL_KEY,
+    owned_companies_total_key,
+    company_members_total_key,
+)
+from app.services.password_hasher import password_hasher
+from app.services.cache import user_cache, company_cache, principal_cache
+from app.db.models.company import Company
+from app.db.models.company_member import CompanyMember
+from app.utils.pagination import paginate, split_page
+from app.utils.streaming import ndjson_rows
+from typing import AsyncIterator, Dict, Optional
 from sqlalchemy.exc import IntegrityError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_users(self, skip: int = 0, limit: int = 10) -> UsersListResponse:
-        logger.info("Fetching users with skip=%s and limit=%s", skip, limit)
+    async def get_users(
+        self, skip: int = 0, limit: int = 10, cursor: Optional[str] = None
+    ) -> UsersListResponse:
+        logger.info(
+            "Fetching users with skip=%s, limit=%s and cursor=%s", skip, limit, cursor
+        )
         result = await self.db.execute(
-            select(User).options(selectinload(User.friends)).offset(skip).limit(limit)
+            paginate(
+                select(User).options(selectinload(User.friends)),
+                User.id,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+            )
         )
-        users = result.scalars().all()
+        users, next_cursor = split_page(result.scalars().all(), limit)
 
-        total_result = await self.db.execute(select(User))
-        total = len(total_result.scalars().all())
+        total = await CounterService(self.db).total(
+            USERS_TOTAL_KEY, select(User), table_name=User.__tablename__
+        )
 
         logger.info("Fetched %s users out of total %s", len(users), total)
-        return UsersListResponse(users=users, total=total)
+        return UsersListResponse(users=users, total=total, next_cursor=next_cursor)
+
+    def stream_users(self) -> AsyncIterator[str]:
+        logger.info("Streaming all users")
+        query = select(User).options(selectinload(User.friends)).order_by(User.id)
+        return ndjson_rows(self.db, query, UserDetailResponse)
 
     async def get_user(self, user_id: int) -> UserDetailResponse:
         logger.info("Fetching user with id=%s", user_id)
+        return await user_cache.get_or_load(user_id, lambda: self._fetch_user(user_id))
+
+    async def _fetch_user(self, user_id: int) -> UserDetailResponse:
         result = await self.db.execute(
             select(User).options(selectinload(User.friends)).filter(User.id == user_id)
         )
@@ -49,6 +79,15 @@ class UserService:
         logger.info("User with id=%s successfully fetched", user_id)
         return UserDetailResponse.model_validate(user)
 
+    async def _befriended_by(self, user_id: int) -> list[int]:
+        # Користувачі, у кешованих відповідях яких цей користувач є серед друзів
+        result = await self.db.execute(
+            select(friends_association.c.user_id).filter(
+                friends_association.c.friend_id == user_id
+            )
+        )
+        return list(result.scalars().all())
+
     async def create_user(self, user_data: SignUpRequest) -> User:
         logger.info("Creating user with email=%s", user_data.email)
         existing_user = await self.db.execute(
@@ -63,7 +102,7 @@ class UserService:
                 status_code=400, detail="error.user.emailAlreadyExists"
             )
 
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         db_user = User(
             name=user_data.name,
             email=user_data.email,
@@ -79,6 +118,7 @@ class UserService:
         self.db.add(db_user)
         await self.db.commit()
         await self.db.refresh(db_user)
+        await CounterService.adjust(USERS_TOTAL_KEY, 1)
 
         logger.info(
             "User with email=%s created successfully with id=%s",
@@ -99,11 +139,14 @@ class UserService:
         update_data = user_data.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            user.hashed_password = pwd_context.hash(update_data.pop("password"))
+            user.hashed_password = await password_hasher.hash(update_data.pop("password"))
 
         if update_data.get("profile_picture") is not None:
             update_data["profile_picture"] = str(update_data["profile_picture"])
 
+        # Запитуємо до змін, щоб autoflush не зробив UPDATE поза try нижче
+        dependent_ids = await self._befriended_by(user_id) if "name" in update_data else []
+
         for key, value in update_data.items():
             setattr(user, key, value)
 
@@ -117,6 +160,8 @@ class UserService:
             raise e
 
         await self.db.refresh(user)
+        await user_cache.invalidate(user_id, *dependent_ids)
+        await principal_cache.invalidate(user_id)
         logger.info("User with id=%s updated successfully", user_id)
         return user
 
@@ -137,8 +182,38 @@ class UserService:
         if auth0_user:
             await self.db.delete(auth0_user)
 
+        owned_companies = await self.db.execute(
+            select(Company.id).filter(Company.owner_id == user_id)
+        )
+        owned_company_ids = owned_companies.scalars().all()
+        memberships = await self.db.execute(
+            select(CompanyMember.company_id).filter(CompanyMember.user_id == user_id)
+        )
+        member_company_ids = set(memberships.scalars().all()) | set(owned_company_ids)
+        dependent_ids = await self._befriended_by(user_id)
+
+        # Зв'язок членств не каскадний, тож прибираємо їх явно: членства
+        # користувача і учасників його компаній
+        await self.db.execute(
+            delete(CompanyMember).where(
+                or_(
+                    CompanyMember.user_id == user_id,
+                    CompanyMember.company_id.in_(owned_company_ids),
+                )
+            )
+        )
         await self.db.delete(user)
         await self.db.commit()
+        await CounterService.adjust(USERS_TOTAL_KEY, -1)
+        # Компанії та членства користувача видалено разом з ним
+        await CounterService.invalidate(
+            COMPANIES_TOTAL_KEY,
+            owned_companies_total_key(user_id),
+            *(company_members_total_key(cid) for cid in member_company_ids),
+        )
+        await user_cache.invalidate(user_id, *dependent_ids)
+        await principal_cache.invalidate(user_id)
+        await company_cache.invalidate(*owned_company_ids)
 
         logger.info("User with id=%s deleted successfully", user_id)
         return {"detail": "User deleted successfully"}
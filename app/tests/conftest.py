@@ -0,0 +1,61 @@
+import pytest
+from app.core.config import cache_settings
+from app.services.counter import _INCR_IF_EXISTS
+from app.services.single_flight import _RELEASE_LOCK
+
+
+class InMemoryRedis:
+    """Мінімальна заміна redis_client для тестів: рядкові ключі без TTL."""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.locks = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx:
+            if key in self.data:
+                return None
+            self.locks.append(key)
+        self.data[key] = value
+        return True
+
+    async def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def eval(self, script, numkeys, *args):
+        # Підтримуються лише зміна лічильника і зняття локу SingleFlight
+        if script == _INCR_IF_EXISTS:
+            key, delta = args
+            if key not in self.data:
+                return None
+            self.data[key] = str(int(self.data[key]) + delta)
+            return int(self.data[key])
+        assert script == _RELEASE_LOCK
+        key, token = args
+        if self.data.get(key) != token:
+            return 0
+        del self.data[key]
+        return 1
+
+
+@pytest.fixture(autouse=True)
+def disable_shared_cache(monkeypatch):
+    # Тести працюють з in-memory SQLite, тому спільний Redis-кеш
+    # не повинен переносити дані між ними
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", False)
+
+
+@pytest.fixture()
+def in_memory_redis():
+    return InMemoryRedis()
@@ -8,6 +8,8 @@ from sqlalchemy import select
 from app.main import app
 from app.db.database import Base, get_db
 from app.db.models.user import User
+from app.schemas.auth import Principal
+from app.services.auth_service import AuthService
 from passlib.context import CryptContext
 
 pytestmark = pytest.mark.asyncio
@@ -101,3 +103,27 @@ async def test_get_me(client: AsyncClient, test_user: User):
     me_data = me_response.json()
     assert me_data["email"] == test_user.email
     assert me_data["id"] == test_user.id
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_returns_principal(test_user: User):
+    async with TestingSessionLocal() as session:
+        token = AuthService(session).create_access_token(
+            data={"sub": str(test_user.id), "email": test_user.email}
+        )
+        principal = await AuthService.get_current_user(token=token, db=session)
+    assert isinstance(principal, Principal)
+    assert principal.id == test_user.id
+    assert principal.email == test_user.email
+
+
+@pytest.mark.asyncio
+async def test_get_me_unknown_user(client: AsyncClient, initialized_db):
+    async with TestingSessionLocal() as session:
+        token = AuthService(session).create_access_token(
+            data={"sub": "999999", "email": "ghost@example.com"}
+        )
+    response = await client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 401, response.text
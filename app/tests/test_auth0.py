@@ -62,3 +62,139 @@ async def test_auth0_dynamic_user_creation(monkeypatch, token_data):
         result = await session.scalar(stmt)
         assert result is not None
         assert result.name == "Auth0 User"
+
+
+@pytest.fixture()
+def hs256_validation(monkeypatch):
+    from app.services import auth0_service
+
+    async def fake_get_public_key(kid: str):
+        return security_settings.JWT_SECRET_KEY
+
+    original_decode = auth0_service.jwt.decode
+
+    def fake_decode(token, key, audience, algorithms, **kwargs):
+        return original_decode(
+            token, key, audience=audience, algorithms=["HS256"], **kwargs
+        )
+
+    monkeypatch.setattr(auth0_service, "get_public_key", fake_get_public_key)
+    monkeypatch.setattr(auth0_service.jwt, "decode", fake_decode)
+    monkeypatch.setattr(auth0_settings, "AUTH0_AUDIENCE", "test-api")
+
+
+def access_token(**claims):
+    payload = {
+        "sub": "auth0|abc123",
+        "aud": "test-api",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+        **claims,
+    }
+    return jwt.encode(
+        payload,
+        security_settings.JWT_SECRET_KEY,
+        algorithm="HS256",
+        headers={"kid": "fake_kid"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_userinfo_cached_per_token(monkeypatch, hs256_validation, in_memory_redis):
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.core.config import cache_settings
+    from app.schemas.auth0 import UserClaims
+    from app.services import auth0_service, cache
+
+    redis = in_memory_redis
+    monkeypatch.setattr(cache, "redis_client", redis)
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", True)
+    cache.local_cache.clear()
+
+    calls = []
+
+    async def fake_fetch_userinfo(token: str):
+        calls.append(token)
+        return UserClaims(
+            sub="auth0|abc123",
+            email="claims@example.com",
+            name="Claims",
+            given_name="",
+            family_name="",
+            picture="",
+            permissions=[],
+        )
+
+    monkeypatch.setattr(auth0_service, "fetch_userinfo", fake_fetch_userinfo)
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=access_token()
+    )
+
+    first = await auth0_service.validate_token(credentials)
+    cache.local_cache.clear()
+    second = await auth0_service.validate_token(credentials)
+
+    assert first == second
+    assert first.email == "claims@example.com"
+    assert len(calls) == 1
+    assert not any(credentials.credentials in key for key in redis.data)
+    cache.local_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_claims_built_from_token(monkeypatch, hs256_validation):
+    from fastapi.security import HTTPAuthorizationCredentials
+    from app.services import auth0_service
+
+    async def fail_fetch_userinfo(token: str):
+        raise AssertionError("userinfo should not be called")
+
+    monkeypatch.setattr(auth0_service, "fetch_userinfo", fail_fetch_userinfo)
+    monkeypatch.setattr(auth0_settings, "AUTH0_CLAIMS_FROM_TOKEN", True)
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer",
+        credentials=access_token(
+            email="token@example.com", name="Token", permissions=["read:users"]
+        ),
+    )
+
+    claims = await auth0_service.validate_token(credentials)
+
+    assert claims.email == "token@example.com"
+    assert claims.permissions == ["read:users"]
+
+
+@pytest.mark.asyncio
+async def test_sync_auth0_user_upserts():
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.db.database import Base
+    from app.db.models.user import Auth0User
+    from app.services.auth0_service import sync_auth0_user
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with SessionLocal() as session:
+        user_id = await sync_auth0_user(
+            session, "auth0|sync", "sync@example.com", "Sync", None, False
+        )
+    async with SessionLocal() as session:
+        same_id = await sync_auth0_user(
+            session, "auth0|sync", "sync@example.com", "Renamed", "pic.png", True
+        )
+
+    async with SessionLocal() as session:
+        users = (await session.scalars(select(User))).all()
+        auth0_users = (await session.scalars(select(Auth0User))).all()
+
+    assert same_id == user_id
+    assert [(u.name, u.profile_picture) for u in users] == [("Renamed", "pic.png")]
+    assert [(a.user_id, a.email_verified) for a in auth0_users] == [(user_id, True)]
+    await engine.dispose()
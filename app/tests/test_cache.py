@@ -0,0 +1,177 @@
+import json
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy import text
+
+from app.core.config import cache_settings
+from app.db.database import Base
+from app.db.models.company import Company
+from app.db.models.user import User
+from app.schemas.company import CompanyUpdate
+from app.schemas.user import UserUpdateRequest
+from app.services import cache
+from app.services.company import CompanyService
+from app.services.user import UserService
+
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+engine = create_async_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(
+    bind=engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch, in_memory_redis):
+    redis = in_memory_redis
+    monkeypatch.setattr(cache, "redis_client", redis)
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", True)
+    cache.local_cache.clear()
+    yield redis
+    cache.local_cache.clear()
+
+
+@pytest_asyncio.fixture()
+async def db_session():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest_asyncio.fixture()
+async def company(db_session):
+    owner = User(name="Owner", email="cache-owner@example.com")
+    db_session.add(owner)
+    await db_session.commit()
+    company = Company(name="Cached", visibility="visible", owner_id=owner.id)
+    db_session.add(company)
+    await db_session.commit()
+    return company
+
+
+@pytest.mark.asyncio
+async def test_company_read_through_and_invalidation(fake_redis, db_session, company):
+    service = CompanyService(db_session)
+    local_hits_before = cache.company_cache.metrics["local_hits"]
+
+    first = await service.get_company(company.id)
+    assert cache.company_cache.key(company.id) in fake_redis.data
+
+    # Зміна в обхід сервісу не видна, поки запис у кеші
+    await db_session.execute(text("UPDATE companies SET name = 'Stale'"))
+    await db_session.commit()
+    second = await service.get_company(company.id)
+    assert second == first
+    assert cache.company_cache.metrics["local_hits"] == local_hits_before + 1
+
+    await service.update_company(
+        company.id, CompanyUpdate(description="Fresh"), current_user_id=company.owner_id
+    )
+    assert cache.company_cache.key(company.id) not in fake_redis.data
+    assert cache.local_cache.get(cache.company_cache.key(company.id)) is None
+    assert fake_redis.published[-1] == (
+        cache_settings.CACHE_INVALIDATION_CHANNEL,
+        json.dumps([cache.company_cache.key(company.id)]),
+    )
+    third = await service.get_company(company.id)
+    assert third.description == "Fresh"
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_populates_local_tier(fake_redis, db_session, company):
+    service = CompanyService(db_session)
+    await service.get_company(company.id)
+    cache.local_cache.clear()
+    hits_before = cache.company_cache.metrics["hits"]
+
+    await service.get_company(company.id)
+    assert cache.company_cache.metrics["hits"] == hits_before + 1
+    assert cache.local_cache.get(cache.company_cache.key(company.id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_friend_changes_invalidate_dependent_user_entries(fake_redis, db_session):
+    friend = User(name="Friend", email="cache-friend@example.com")
+    user = User(name="User", email="cache-user@example.com", friends=[friend])
+    db_session.add(user)
+    await db_session.commit()
+    service = UserService(db_session)
+
+    assert (await service.get_user(user.id)).friends[0].name == "Friend"
+    await service.update_user(friend.id, UserUpdateRequest(name="Renamed"))
+    assert cache.user_cache.key(user.id) not in fake_redis.data
+    assert (await service.get_user(user.id)).friends[0].name == "Renamed"
+
+    await service.delete_user(friend.id)
+    assert cache.local_cache.get(cache.user_cache.key(user.id)) is None
+    # Зв'язок друзів у сесії вже завантажений, перечитуємо з БД
+    db_session.expire(user, ["friends"])
+    assert (await service.get_user(user.id)).friends == []
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = cache.LocalCache(max_size=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    local = cache.LocalCache(max_size=10, ttl=5)
+    local.set("a", 1)
+    now[0] += 4
+    assert local.get("a") == 1
+    now[0] += 2
+    assert local.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_survives_unexpected_errors(monkeypatch):
+    import asyncio
+
+    subscriptions = []
+
+    class FlakyPubSub:
+        async def subscribe(self, channel):
+            subscriptions.append(channel)
+
+        async def listen(self):
+            if len(subscriptions) == 1:
+                raise RuntimeError("unexpected message")
+            yield {"type": "message", "data": json.dumps(["user:1"])}
+            await asyncio.Event().wait()
+
+        async def close(self):
+            pass
+
+    class PubSubRedis:
+        def pubsub(self):
+            return FlakyPubSub()
+
+    monkeypatch.setattr(cache, "redis_client", PubSubRedis())
+    cache.local_cache.set("user:1", {"id": 1}, ttl=60)
+    listener = asyncio.create_task(cache.listen_for_invalidations(retry_delay=0))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+    assert len(subscriptions) == 2
+    assert cache.local_cache.get("user:1") is None
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+
+from app.core.config import cache_settings
+from app.services import client_token, single_flight
+from app.services.client_token import ClientTokenCache
+
+
+@pytest.fixture()
+def token_endpoint():
+    endpoint = {"calls": 0}
+
+    async def fetch(audience):
+        endpoint["calls"] += 1
+        return {
+            "access_token": f"{audience}-token-{endpoint['calls']}",
+            "expires_in": 3600,
+        }
+
+    endpoint["fetch"] = fetch
+    return endpoint
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client_token.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.mark.asyncio
+async def test_token_is_reused_until_refresh_window(token_endpoint, clock):
+    tokens = ClientTokenCache(token_endpoint["fetch"], refresh_margin=300)
+
+    assert await tokens.get("api") == "api-token-1"
+    clock[0] += 3000
+    assert await tokens.get("api") == "api-token-1"
+    assert await tokens.get("other") == "other-token-2"
+    assert token_endpoint["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_token_refreshes_ahead_of_expiry(token_endpoint, clock):
+    tokens = ClientTokenCache(token_endpoint["fetch"], refresh_margin=300)
+    await tokens.get("api")
+
+    # Старий токен ще дійсний — віддаємо його, оновлення йде у фоні
+    clock[0] += 3400
+    assert await tokens.get("api") == "api-token-1"
+    await asyncio.gather(*tokens._refreshing.values())
+    assert await tokens.get("api") == "api-token-2"
+
+    clock[0] += 3600
+    assert await tokens.get("api") == "api-token-3"
+
+
+@pytest.mark.asyncio
+async def test_token_is_shared_between_workers(token_endpoint, clock, monkeypatch, in_memory_redis):
+    monkeypatch.setattr(client_token, "redis_client", in_memory_redis)
+    monkeypatch.setattr(single_flight, "redis_client", in_memory_redis)
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", True)
+    first_worker = ClientTokenCache(token_endpoint["fetch"], refresh_margin=300)
+    second_worker = ClientTokenCache(token_endpoint["fetch"], refresh_margin=300)
+
+    assert await first_worker.get("api") == "api-token-1"
+    assert await second_worker.get("api") == "api-token-1"
+    assert token_endpoint["calls"] == 1
+    # Обидва воркери брали лок SingleFlight, другий знайшов токен у Redis
+    assert in_memory_redis.locks == ["lock:auth0:client_token:api"] * 2
+    assert "lock:auth0:client_token:api" not in in_memory_redis.data
@@ -0,0 +1,378 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy import event, select
+
+from app.db.database import Base
+from app.db.models.company import Company
+from app.db.models.company_invitation import InvitationStatus
+from app.db.models.company_member import CompanyMember
+from app.db.models.company_membership_request import MembershipRequestStatus
+from app.db.models.user import User
+from app.schemas.auth import Principal
+from app.services.company_actions import CompanyActionsService
+
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+engine = create_async_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(
+    bind=engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest_asyncio.fixture()
+async def db_session():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def principal(user: User) -> Principal:
+    return Principal(id=user.id, email=user.email)
+
+
+@pytest_asyncio.fixture()
+async def users(db_session):
+    owner = User(name="Owner", email="actions-owner@example.com")
+    invitee = User(name="Invitee", email="actions-invitee@example.com")
+    stranger = User(name="Stranger", email="actions-stranger@example.com")
+    db_session.add_all([owner, invitee, stranger])
+    await db_session.commit()
+    return owner, invitee, stranger
+
+
+@pytest_asyncio.fixture()
+async def company(db_session, users):
+    owner, _, _ = users
+    company = Company(name="Actions", visibility="visible", owner_id=owner.id)
+    db_session.add(company)
+    await db_session.commit()
+    return company
+
+
+async def members_of(db_session, company_id):
+    result = await db_session.execute(
+        select(CompanyMember.user_id).filter(CompanyMember.company_id == company_id)
+    )
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_accept_invitation_only_once(db_session, users, company):
+    owner, invitee, _ = users
+    service = CompanyActionsService(db_session)
+    invitation = await service.send_invitation(company.id, invitee.id, principal(owner))
+
+    accepted = await service.accept_invitation(invitation.id, principal(invitee))
+    assert accepted.status == InvitationStatus.accepted
+    assert await members_of(db_session, company.id) == [invitee.id]
+
+    with pytest.raises(HTTPException) as exc:
+        await service.accept_invitation(invitation.id, principal(invitee))
+    assert exc.value.detail == "error.invitation.notPending"
+    assert await members_of(db_session, company.id) == [invitee.id]
+
+
+@pytest.mark.asyncio
+async def test_invitation_transition_errors(db_session, users, company):
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    invitation = await service.send_invitation(company.id, invitee.id, principal(owner))
+
+    with pytest.raises(HTTPException) as exc:
+        await service.decline_invitation(invitation.id, principal(stranger))
+    assert exc.value.status_code == 403
+    assert exc.value.detail == "error.invitation.notAuthorizedDecline"
+
+    with pytest.raises(HTTPException) as exc:
+        await service.cancel_invitation(invitation.id, principal(invitee))
+    assert exc.value.detail == "error.invitation.notAuthorizedCancel"
+
+    with pytest.raises(HTTPException) as exc:
+        await service.accept_invitation(invitation.id + 100, principal(invitee))
+    assert exc.value.status_code == 404
+
+    cancelled = await service.cancel_invitation(invitation.id, principal(owner))
+    assert cancelled.status == InvitationStatus.cancelled
+
+
+@pytest.mark.asyncio
+async def test_handle_membership_request(db_session, users, company):
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    request = await service.request_membership(company.id, principal(invitee))
+
+    with pytest.raises(HTTPException) as exc:
+        await service.handle_membership_request(request.id, "accept", principal(stranger))
+    assert exc.value.detail == "error.membership.notAuthorizedHandle"
+
+    with pytest.raises(HTTPException) as exc:
+        await service.handle_membership_request(request.id, "maybe", principal(owner))
+    assert exc.value.detail == "error.membership.invalidAction"
+
+    handled = await service.handle_membership_request(request.id, "accept", principal(owner))
+    assert handled.status == MembershipRequestStatus.accepted
+    assert await members_of(db_session, company.id) == [invitee.id]
+
+    with pytest.raises(HTTPException) as exc:
+        await service.cancel_membership_request(request.id, principal(invitee))
+    assert exc.value.detail == "error.membership.cannotCancelNonPending"
+
+
+@pytest.mark.asyncio
+async def test_duplicates_are_rejected_by_unique_indexes(db_session, users, company):
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    await service.send_invitation(company.id, invitee.id, principal(owner))
+    with pytest.raises(HTTPException) as exc:
+        await service.send_invitation(company.id, invitee.id, principal(owner))
+    assert exc.value.detail == "error.invitation.alreadySent"
+
+    request = await service.request_membership(company.id, principal(stranger))
+    with pytest.raises(HTTPException) as exc:
+        await service.request_membership(company.id, principal(stranger))
+    assert exc.value.detail == "error.membership.alreadyRequested"
+
+    # Після відхилення запиту можна подати новий
+    await service.handle_membership_request(request.id, "decline", principal(owner))
+    await service.request_membership(company.id, principal(stranger))
+
+
+@pytest.mark.asyncio
+async def test_accept_does_not_duplicate_existing_member(db_session, users, company):
+    owner, invitee, _ = users
+    service = CompanyActionsService(db_session)
+    db_session.add(CompanyMember(company_id=company.id, user_id=invitee.id))
+    await db_session.commit()
+
+    invitation = await service.send_invitation(company.id, invitee.id, principal(owner))
+    await service.accept_invitation(invitation.id, principal(invitee))
+
+    assert await members_of(db_session, company.id) == [invitee.id]
+
+
+@pytest.mark.asyncio
+async def test_service_queries_use_indexes(db_session, users, company):
+    owner, invitee, _ = users
+    service = CompanyActionsService(db_session)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        for status in (None, "pending"):
+            await service.get_invitations_for_user(principal(invitee), status)
+            await service.get_invitations_for_company(company.id, principal(owner), status)
+            await service.get_membership_requests_for_user(principal(invitee), status)
+            await service.get_membership_requests_for_company(company.id, principal(owner), status)
+        await service.get_company_members(company.id)
+        await service.get_user_companies(owner.id)
+        await service.get_companies_where_user_is_member(principal(invitee))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    tables = set(Base.metadata.tables)
+    conn = await db_session.connection()
+    assert statements
+    for statement, parameters in statements:
+        plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+        # "SCAN <таблиця>" — повний перебір таблиці або індексу, а не пошук за ключем
+        full_scans = [
+            row.detail for row in plan
+            if row.detail.startswith("SCAN ") and row.detail.split()[1] in tables
+        ]
+        assert not full_scans, (statement, full_scans)
+        # Зі статусом сторінку за id віддає сам індекс, без сортування
+        if "status = ?" in statement and "ORDER BY" in statement:
+            assert not [row for row in plan if "TEMP B-TREE" in row.detail], statement
+
+
+@pytest.mark.asyncio
+async def test_send_invitations_reports_each_id(db_session, users, company):
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    newcomer = User(name="Newcomer", email="actions-newcomer@example.com")
+    db_session.add(newcomer)
+    db_session.add(CompanyMember(company_id=company.id, user_id=stranger.id))
+    await db_session.commit()
+    await service.send_invitation(company.id, invitee.id, principal(owner))
+
+    response = await service.send_invitations(
+        company.id, [newcomer.id, invitee.id, stranger.id, 9999, newcomer.id], principal(owner)
+    )
+
+    outcomes = [(item.invited_user_id, item.error) for item in response.results]
+    assert outcomes == [
+        (newcomer.id, None),
+        (invitee.id, "error.invitation.alreadySent"),
+        (stranger.id, "error.membership.alreadyMember"),
+        (9999, "error.user.notFound"),
+        (newcomer.id, "error.invitation.alreadySent"),
+    ]
+    assert response.results[0].invitation_id is not None
+    assert (response.invited, response.skipped) == (1, 4)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.send_invitations(company.id, [newcomer.id], principal(invitee))
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_read_csv_ids_streams_chunks():
+    from app.utils.csv_ids import read_csv_ids
+
+    async def chunks(*parts):
+        for part in parts:
+            yield part
+
+    assert await read_csv_ids(chunks(b"user_id\n1\n2", b"3\r\n", b"4,extra\n"), 10) == [1, 23, 4]
+
+    with pytest.raises(HTTPException) as exc:
+        await read_csv_ids(chunks(b"1\nabc\n"), 10)
+    assert exc.value.detail == "error.bulk.invalidCsv"
+
+    with pytest.raises(HTTPException) as exc:
+        await read_csv_ids(chunks(b"1\n2\n3\n"), 2)
+    assert exc.value.detail == "error.bulk.tooManyItems"
+
+
+@pytest.mark.asyncio
+async def test_handle_membership_requests_in_bulk(db_session, users, company):
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    newcomer = User(name="Newcomer", email="actions-newcomer@example.com")
+    db_session.add(newcomer)
+    await db_session.commit()
+    first = await service.request_membership(company.id, principal(invitee))
+    second = await service.request_membership(company.id, principal(stranger))
+    third = await service.request_membership(company.id, principal(newcomer))
+    await service.cancel_membership_request(third.id, principal(newcomer))
+
+    with pytest.raises(HTTPException) as exc:
+        await service.handle_membership_requests(company.id, "accept", [first.id], principal(invitee))
+    assert exc.value.status_code == 403
+
+    response = await service.handle_membership_requests(
+        company.id, "accept", [first.id, third.id, 9999], principal(owner)
+    )
+    assert (response.processed, response.members_added) == (1, 1)
+    assert [(f.request_id, f.error) for f in response.failed] == [
+        (third.id, "error.membership.notPending"),
+        (9999, "error.membership.notFound"),
+    ]
+    assert await members_of(db_session, company.id) == [invitee.id]
+
+    response = await service.handle_membership_requests(company.id, "decline", None, principal(owner))
+    assert (response.processed, response.members_added, response.failed) == (1, 0, [])
+    await db_session.refresh(second)
+    assert second.status == MembershipRequestStatus.declined
+
+
+@pytest.mark.asyncio
+async def test_company_members_include_user_summaries(db_session, users, company):
+    from sqlalchemy import inspect
+    from app.schemas.company_actions import CompanyMemberWithUserResponse
+
+    owner, invitee, stranger = users
+    invitee.profile_picture = "http://example.com/invitee.png"
+    db_session.add_all([
+        CompanyMember(company_id=company.id, user_id=invitee.id),
+        CompanyMember(company_id=company.id, user_id=stranger.id),
+    ])
+    await db_session.commit()
+    db_session.expunge_all()
+    service = CompanyActionsService(db_session)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        members, total, _ = await service.get_company_members(company.id, include_user=True)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    data = [CompanyMemberWithUserResponse.model_validate(m).model_dump(mode="json", by_alias=True) for m in members]
+    assert [(d["user"]["name"], d["user"]["profilePicture"]) for d in data] == [
+        ("Invitee", invitee.profile_picture),
+        ("Stranger", None),
+    ]
+    assert "friends" in inspect(members[0].user).unloaded
+    assert not any("friends" in statement for statement in statements)
+    # Сторінка учасників, один IN-запит за користувачами і підрахунок total
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_invitation_lists_filter_by_status_and_page_by_cursor(db_session, users, company):
+    owner, invitee, _ = users
+    service = CompanyActionsService(db_session)
+    cancelled = await service.send_invitation(company.id, invitee.id, principal(owner))
+    await service.cancel_invitation(cancelled.id, principal(owner))
+    newcomers = [User(name=f"Newcomer {i}", email=f"actions-newcomer-{i}@example.com") for i in range(3)]
+    db_session.add_all(newcomers)
+    await db_session.commit()
+    pending = [
+        (await service.send_invitation(company.id, user.id, principal(owner))).id
+        for user in [invitee, *newcomers]
+    ]
+
+    first, cursor = await service.get_invitations_for_company(company.id, principal(owner), "pending", 3)
+    second, last_cursor = await service.get_invitations_for_company(company.id, principal(owner), "pending", 3, cursor)
+    assert [i.id for i in first + second] == pending
+    assert last_cursor is None
+
+    history, _ = await service.get_invitations_for_user(principal(invitee))
+    assert [i.id for i in history] == [cancelled.id, pending[0]]
+    declined, _ = await service.get_invitations_for_user(principal(invitee), "declined")
+    assert declined == []
+
+
+@pytest.mark.asyncio
+async def test_invitation_list_endpoint_keeps_list_body_and_pages_by_header(db_session, users, company):
+    from httpx import ASGITransport, AsyncClient
+    from app.db.database import get_read_db
+    from app.main import app
+    from app.services.auth_service import AuthService
+
+    owner, invitee, stranger = users
+    service = CompanyActionsService(db_session)
+    first = await service.send_invitation(company.id, invitee.id, principal(owner))
+    second = await service.send_invitation(company.id, stranger.id, principal(owner))
+
+    async def override_get_read_db():
+        yield db_session
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[AuthService.get_current_user] = lambda: principal(owner)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            url = f"/companies/{company.id}/invitations"
+            everything = await client.get(url)
+            page = await client.get(url, params={"status": "pending", "limit": 1})
+            rest = await client.get(url, params={"status": "pending", "limit": 1, "cursor": page.headers["X-Next-Cursor"]})
+    finally:
+        app.dependency_overrides.pop(get_read_db)
+        app.dependency_overrides.pop(AuthService.get_current_user)
+
+    assert [i["id"] for i in everything.json()] == [first.id, second.id]
+    assert "X-Next-Cursor" not in everything.headers
+    assert [i["id"] for i in page.json()] == [first.id]
+    assert page.headers["Link"].endswith('>; rel="next"')
+    assert f"cursor={page.headers['X-Next-Cursor']}" in page.headers["Link"]
+    assert [i["id"] for i in rest.json()] == [second.id]
+    assert "Link" not in rest.headers
@@ -1,3 +1,4 @@
+import json
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
@@ -8,7 +9,7 @@ from sqlalchemy import text
 from passlib.context import CryptContext
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_read_db
 from app.db.models.company import Company
 from app.db.models.user import User
 from app.services.auth_service import AuthService
@@ -48,6 +49,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -291,3 +293,27 @@ async def test_get_companies(client, db_session, test_owner):
     assert "total" in data
     assert len(data["companies"]) == 2
     assert data["total"] >= 5
+
+
+@pytest.mark.asyncio
+async def test_get_companies_limit_is_bounded(client, db_session, test_owner):
+    response = await client.get("/companies/", params={"limit": 1000000})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stream_companies(client, db_session, test_owner):
+    db_session.add_all(
+        [
+            Company(name=f"Streamed {i}", visibility="visible", owner_id=test_owner.id)
+            for i in range(3)
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get("/companies/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Streamed 0", "Streamed 1", "Streamed 2"]
+    assert all(row["owner_id"] == test_owner.id for row in rows)
@@ -0,0 +1,96 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy import select
+
+from app.core.config import cache_settings
+from app.db.database import Base
+from app.db.models.company import Company
+from app.db.models.company_member import CompanyMember
+from app.db.models.user import User
+from app.services import counter
+from app.services.counter import (
+    CounterService,
+    USERS_TOTAL_KEY,
+    COMPANIES_TOTAL_KEY,
+    owned_companies_total_key,
+    company_members_total_key,
+)
+from app.services.user import UserService
+
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+engine = create_async_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(
+    bind=engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+@pytest_asyncio.fixture()
+async def db_session():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            [
+                User(name=f"User {i}", email=f"counter{i}@example.com", age=20 + i)
+                for i in range(7)
+            ]
+        )
+        await session.commit()
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.mark.asyncio
+async def test_count_ignores_pagination(db_session):
+    service = CounterService(db_session)
+    query = select(User).filter(User.age >= 23).offset(2).limit(1)
+    assert await service.count(query) == 4
+
+
+@pytest.mark.asyncio
+async def test_estimate_is_postgres_only(db_session):
+    service = CounterService(db_session)
+    assert await service.estimate(User.__tablename__) is None
+
+
+@pytest.mark.asyncio
+async def test_total_falls_back_to_exact_count(db_session):
+    service = CounterService(db_session)
+    total = await service.total(
+        USERS_TOTAL_KEY, select(User), table_name=User.__tablename__
+    )
+    assert total == 7
+
+
+@pytest.mark.asyncio
+async def test_delete_user_invalidates_dependent_totals(db_session, in_memory_redis, monkeypatch):
+    monkeypatch.setattr(counter, "redis_client", in_memory_redis)
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", True)
+    owner, member = (await db_session.execute(select(User).order_by(User.id).limit(2))).scalars().all()
+    owned = Company(name="Owned", visibility="visible", owner_id=member.id)
+    joined = Company(name="Joined", visibility="visible", owner_id=owner.id)
+    db_session.add_all([owned, joined])
+    await db_session.commit()
+    db_session.add(CompanyMember(company_id=joined.id, user_id=member.id))
+    await db_session.commit()
+
+    keys = [
+        COMPANIES_TOTAL_KEY,
+        owned_companies_total_key(member.id),
+        company_members_total_key(owned.id),
+        company_members_total_key(joined.id),
+    ]
+    in_memory_redis.data.update({key: "5" for key in keys + [USERS_TOTAL_KEY]})
+
+    await UserService(db_session).delete_user(member.id)
+
+    assert in_memory_redis.data == {USERS_TOTAL_KEY: "4"}
@@ -0,0 +1,104 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services import http_client
+from app.services.http_client import Auth0Client, CircuitBreaker
+
+
+def make_client(handler, retries=2, failure_threshold=5):
+    return Auth0Client(
+        base_url="https://auth0.test",
+        timeout=1.0,
+        max_connections=5,
+        max_keepalive_connections=5,
+        retries=retries,
+        backoff=0,
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=30),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) < 3:
+            raise httpx.ConnectError("connection reset")
+        return httpx.Response(200, json={"sub": "auth0|1"})
+
+    client = make_client(handler)
+    response = await client.get("/userinfo")
+    await client.close()
+
+    assert response.json() == {"sub": "auth0|1"}
+    assert calls == ["/userinfo"] * 3
+    assert client.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(401)
+
+    client = make_client(handler)
+    response = await client.get("/userinfo")
+    await client.close()
+
+    assert response.status_code == 401
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_count_as_one_failure():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = make_client(handler, retries=2, failure_threshold=2)
+    response = await client.get("/userinfo")
+    assert response.status_code == 503
+    assert len(calls) == 3
+    assert client.breaker.failures == 1
+    assert client.breaker.state == "closed"
+
+    await client.get("/userinfo")
+    await client.close()
+    assert client.breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectTimeout("auth0 is down")
+
+    client = make_client(handler, retries=0, failure_threshold=2)
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            await client.get("/userinfo")
+        assert exc.value.status_code == 503
+    assert client.breaker.state == "open"
+
+    with pytest.raises(HTTPException):
+        await client.get("/userinfo")
+    assert len(calls) == 2
+
+    # Після reset_timeout пропускається одна проба
+    now[0] += 31
+    with pytest.raises(HTTPException):
+        await client.get("/userinfo")
+    assert len(calls) == 3
+    assert client.breaker.state == "open"
+    await client.close()
@@ -0,0 +1,172 @@
+import json
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobQueue
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def lrem(self, key, count, value):
+        self.commands.append(("lrem", key, value))
+
+    def zadd(self, key, mapping):
+        self.commands.append(("zadd", key, mapping))
+
+    def lpush(self, key, value):
+        self.commands.append(("lpush", key, value))
+
+    async def execute(self):
+        for command, key, value in self.commands:
+            if command == "lrem":
+                self.redis.lists.setdefault(key, []).remove(value)
+            elif command == "zadd":
+                self.redis.zsets.setdefault(key, {}).update(value)
+            else:
+                self.redis.lists.setdefault(key, []).insert(0, value)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.zsets = {}
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def rpoplpush(self, source, destination):
+        if not self.lists.get(source):
+            return None
+        value = self.lists[source].pop()
+        self.lists.setdefault(destination, []).insert(0, value)
+        return value
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FailingRedis:
+    async def lpush(self, key, value):
+        raise RedisConnectionError("redis is down")
+
+
+def make_queue(max_attempts=2):
+    return JobQueue(
+        name="test",
+        consumers=1,
+        max_attempts=max_attempts,
+        retry_backoff=1.0,
+        drain_timeout=1.0,
+        heartbeat_ttl=30,
+        poll_timeout=1,
+    )
+
+
+async def take(queue, redis):
+    return await redis.rpoplpush(queue.queue_key, queue.processing_key(queue.consumer_id))
+
+
+@pytest.mark.asyncio
+async def test_job_is_acked_after_handler_succeeds(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(job_queue_module, "redis_client", redis)
+    queue = make_queue()
+    handled = []
+
+    async def handler(payload):
+        handled.append(payload)
+
+    queue.register("sync", handler)
+    await queue.enqueue("sync", {"id_token": "abc"})
+    await queue._process(await take(queue, redis))
+
+    assert handled == [{"id_token": "abc"}]
+    assert redis.lists[queue.processing_key(queue.consumer_id)] == []
+    assert queue.metrics["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_dead_lettered(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(job_queue_module, "redis_client", redis)
+    queue = make_queue(max_attempts=2)
+
+    async def handler(payload):
+        raise RuntimeError("database is down")
+
+    queue.register("sync", handler)
+    await queue.enqueue("sync", {"id_token": "abc"})
+    await queue._process(await take(queue, redis))
+
+    [retry] = redis.zsets[queue.delayed_key]
+    assert json.loads(retry)["attempts"] == 1
+
+    # Повтор настав — повертаємо задачу в чергу, як це робить _PROMOTE_DELAYED
+    await redis.lpush(queue.queue_key, retry)
+    await queue._process(await take(queue, redis))
+
+    [dead] = redis.lists[queue.dead_key]
+    assert json.loads(dead)["attempts"] == 2
+    assert json.loads(dead)["error"] == "database is down"
+    assert redis.lists[queue.processing_key(queue.consumer_id)] == []
+
+
+@pytest.mark.asyncio
+async def test_job_runs_inline_and_drains_without_redis(monkeypatch):
+    monkeypatch.setattr(job_queue_module, "redis_client", FailingRedis())
+    queue = make_queue()
+    handled = []
+
+    async def handler(payload):
+        handled.append(payload)
+
+    async def recover(consumer_id, force=False):
+        pass
+
+    monkeypatch.setattr(queue, "_recover", recover)
+    queue.register("sync", handler)
+    await queue.enqueue("sync", {"id_token": "abc"})
+    await queue.stop()
+
+    assert handled == [{"id_token": "abc"}]
+    assert queue.metrics["inline"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_sync_is_retried_while_jwks_is_down(monkeypatch):
+    import httpx
+    from jose import jwt
+    from app.services import auth0_service, jwks
+    from app.services.jwks import JWKSManager
+
+    redis = FakeRedis()
+    monkeypatch.setattr(job_queue_module, "redis_client", redis)
+
+    async def jwks_down(url, **kwargs):
+        raise httpx.ConnectError("auth0 is down")
+
+    monkeypatch.setattr(jwks.auth0_client, "get", jwks_down)
+    monkeypatch.setattr(
+        auth0_service, "jwks_manager", JWKSManager("https://auth0/jwks", ttl=3600, min_refresh_interval=0)
+    )
+    queue = make_queue(max_attempts=3)
+    queue.register(auth0_service.AUTH0_USER_SYNC_JOB, auth0_service.decode_and_update_db)
+    id_token = jwt.encode({"sub": "auth0|abc"}, "secret", algorithm="HS256", headers={"kid": "k1"})
+
+    await queue.enqueue(auth0_service.AUTH0_USER_SYNC_JOB, {"id_token": id_token})
+    await queue._process(await take(queue, redis))
+
+    [retry] = redis.zsets[queue.delayed_key]
+    assert json.loads(retry)["attempts"] == 1
+    assert queue.metrics["retried"] == 1
+    assert queue.metrics["processed"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk
+
+from app.services import jwks
+from app.services.jwks import JWKSManager
+
+
+def make_jwk(kid: str) -> dict:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    public_jwk["kid"] = kid
+    return public_jwk
+
+
+class FakeResponse:
+    def __init__(self, keys):
+        self.keys = keys
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"keys": self.keys}
+
+
+@pytest.fixture()
+def jwks_endpoint(monkeypatch):
+    endpoint = {"keys": [make_jwk("kid-1")], "calls": 0, "fail": False}
+
+    async def fake_get(url, **kwargs):
+        endpoint["calls"] += 1
+        if endpoint["fail"]:
+            raise httpx.ConnectError("auth0 is down")
+        return FakeResponse(endpoint["keys"])
+
+    monkeypatch.setattr(jwks.auth0_client, "get", fake_get)
+    return endpoint
+
+
+@pytest.mark.asyncio
+async def test_keys_load_lazily_on_first_use(jwks_endpoint):
+    manager = JWKSManager("https://auth0.test/jwks", ttl=3600, min_refresh_interval=30)
+    assert jwks_endpoint["calls"] == 0
+    assert manager.find("kid-1") is None
+
+    key = await manager.get("kid-1")
+    assert key is not None
+    assert manager.find("kid-1") is key
+    assert jwks_endpoint["calls"] == 1
+
+    await manager.get("kid-1")
+    assert jwks_endpoint["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_callers_during_fetch_wait_for_it(jwks_endpoint, monkeypatch):
+    fetch_started = asyncio.Event()
+    release = asyncio.Event()
+    fast_get = jwks.auth0_client.get
+
+    async def slow_get(url, **kwargs):
+        fetch_started.set()
+        await release.wait()
+        return await fast_get(url, **kwargs)
+
+    monkeypatch.setattr(jwks.auth0_client, "get", slow_get)
+    manager = JWKSManager("https://auth0.test/jwks", ttl=3600, min_refresh_interval=30)
+    first = asyncio.create_task(manager.get("kid-1"))
+    await fetch_started.wait()
+    second = asyncio.create_task(manager.get("kid-1"))
+    await asyncio.sleep(0)
+    release.set()
+
+    keys = await asyncio.gather(first, second)
+    assert keys[0] is not None and keys[1] is keys[0]
+    assert jwks_endpoint["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refresh_is_rate_limited(jwks_endpoint, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jwks.time, "monotonic", lambda: now[0])
+    manager = JWKSManager("https://auth0.test/jwks", ttl=3600, min_refresh_interval=30)
+    await manager.get("kid-1")
+
+    jwks_endpoint["keys"] = jwks_endpoint["keys"] + [make_jwk("kid-2")]
+    assert await manager.get("kid-2") is None
+    assert jwks_endpoint["calls"] == 1
+
+    now[0] += 31
+    assert await manager.get("kid-2") is not None
+    assert jwks_endpoint["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_keys(jwks_endpoint):
+    manager = JWKSManager("https://auth0.test/jwks", ttl=3600, min_refresh_interval=0)
+    await manager.refresh()
+    jwks_endpoint["fail"] = True
+    await manager.refresh()
+    assert manager.find("kid-1") is not None
@@ -0,0 +1,42 @@
+import json
+import logging
+import queue
+
+from app.core.logger import HotPathRateLimit, JsonFormatter, NonBlockingQueueHandler
+
+
+def make_record(name: str, level: int, msg: str, *args, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, args, exc_info)
+
+
+def test_queue_handler_formats_message_and_drops_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        handler.handle(make_record("app.test", logging.ERROR, "failed %s", 42, exc_info=(type(e), e, e.__traceback__)))
+    handler.handle(make_record("app.test", logging.INFO, "dropped"))
+
+    assert handler.dropped == 1
+    entry = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+    assert (entry["level"], entry["logger"], entry["message"]) == ("ERROR", "app.test", "failed 42")
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_hot_path_rate_limit_keeps_warnings():
+    hot = "app.services.company_actions"
+    handler = NonBlockingQueueHandler(queue.Queue(), HotPathRateLimit([hot], per_second=2))
+
+    for _ in range(5):
+        handler.handle(make_record(hot, logging.INFO, "call"))
+    handler.handle(make_record(hot, logging.WARNING, "warn"))
+    handler.handle(make_record("app.services.user", logging.INFO, "other"))
+    assert handler.rate_limited == 3
+
+    handler.rate_limit._buckets[hot][0] = 1
+    record = make_record(hot, logging.INFO, "call %s", 7)
+    handler.handle(record)
+    # Суфікс додається лише до копії в черзі
+    assert record.getMessage() == "call 7"
+    messages = [handler.queue.get_nowait().getMessage() for _ in range(handler.queue.qsize())]
+    assert messages == ["call", "call", "warn", "other", "call 7 (+3 suppressed)"]
@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.middleware import RequestLoggingMiddleware
+
+
+def build_app(**options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    def health():
+        return {"detail": "ok"}
+
+    @app.get("/metrics/cache")
+    def metrics():
+        return {}
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestLoggingMiddleware, exclude_paths=["/", "/metrics"], **options)
+    return app
+
+
+def messages(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.name == "app.core.logger"]
+
+
+@pytest.mark.asyncio
+async def test_logs_route_template_and_server_timing(caplog):
+    caplog.set_level(logging.INFO, logger="app.core.logger")
+    transport = ASGITransport(app=build_app(), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items/42")
+        streamed = await client.get("/stream")
+        await client.get("/")
+        await client.get("/metrics/cache")
+        failed = await client.get("/boom")
+
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert streamed.content == b"abc"
+    assert failed.status_code == 500
+    logged = messages(caplog)
+    assert [m.rsplit(" ", 1)[0] for m in logged] == [
+        "GET /items/{item_id} 200",
+        "GET /stream 200",
+        "GET /boom 500",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sampling_keeps_errors_and_slow_requests(caplog):
+    caplog.set_level(logging.INFO, logger="app.core.logger")
+    transport = ASGITransport(app=build_app(sample_rate=0.0, server_timing=False), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items/1")
+        await client.get("/boom")
+
+    assert "server-timing" not in response.headers
+    assert [m.rsplit(" ", 1)[0] for m in messages(caplog)] == ["GET /boom 500"]
+
+    caplog.clear()
+    transport = ASGITransport(app=build_app(sample_rate=0.0, slow_ms=0.0))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+    assert [m.rsplit(" ", 1)[0] for m in messages(caplog)] == ["GET /items/{item_id} 200"]
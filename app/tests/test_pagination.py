@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.user import User
+from app.utils.pagination import decode_cursor, paginate, split_page
+
+
+def test_split_page_returns_cursor_of_last_row():
+    rows = [SimpleNamespace(id=i) for i in (1, 2, 3)]
+
+    page, cursor = split_page(rows, 2)
+    assert [row.id for row in page] == [1, 2]
+    assert decode_cursor(cursor) == 2
+    assert split_page(rows, 3) == (rows, None)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limit_is_rejected(limit):
+    with pytest.raises(ValueError):
+        split_page([SimpleNamespace(id=1)], limit)
+    with pytest.raises(ValueError):
+        paginate(select(User), User.id, limit=limit)
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+
+from app.services.password_hasher import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_off_the_event_loop():
+    hasher = PasswordHasher(max_workers=2, max_pending=4)
+    hashed = await hasher.hash("secret")
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("wrong", hashed)
+    assert hasher.metrics["hash_count"] == 1
+    assert hasher.metrics["verify_count"] == 2
+    assert hasher.metrics["queue_depth"] == 0
+    await hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    results = await asyncio.gather(
+        *(hasher.hash("secret") for _ in range(4)), return_exceptions=True
+    )
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 2
+    assert all(r.status_code == 503 for r in rejected)
+    assert hasher.metrics["rejected"] == 2
+    await hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hasher_is_usable_after_shutdown():
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    hashed = await hasher.hash("secret")
+    await hasher.shutdown()
+    # Наступний lifespan у тому ж процесі отримує новий пул
+    assert await hasher.verify("secret", hashed)
+    await hasher.shutdown()
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import TimedQueuePool, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    async with engine.connect():
+        stats = pool_stats(engine)
+        assert (stats["size"], stats["checked_out"], stats["overflow"]) == (1, 1, 0)
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+
+    stats = pool_stats(engine)
+    await engine.dispose()
+    assert (stats["checked_out"], stats["checkouts"], stats["timeouts"]) == (0, 1, 1)
+    assert stats["wait_ms_max"] >= 50
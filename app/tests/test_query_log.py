@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.middleware import RequestLoggingMiddleware
+from app.db.query_log import install_query_logging, slow_queries
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_captured_with_route(caplog):
+    caplog.set_level(logging.INFO, logger="app.db.query_log")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_query_logging(engine.sync_engine, mode="slow", sample_rate=1.0, slow_ms=0.0)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        async with engine.connect() as conn:
+            return {"value": (await conn.execute(text("SELECT :id"), {"id": item_id})).scalar()}
+
+    app.add_middleware(RequestLoggingMiddleware)
+    slow_queries.clear()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/items/7")).json() == {"value": 7}
+    await engine.dispose()
+
+    assert [(q["statement"], q["route"]) for q in slow_queries] == [("SELECT ?", "GET /items/{item_id}")]
+    assert any(r.levelno == logging.WARNING and "GET /items/{item_id}" in r.getMessage() for r in caplog.records)
+
+
+def test_off_mode_installs_no_listeners():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_query_logging(engine.sync_engine, mode="off", sample_rate=1.0, slow_ms=0.0)
+    assert not engine.sync_engine.dispatch.before_cursor_execute
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_nothing_on_the_connection():
+    from sqlalchemy.exc import OperationalError
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_query_logging(engine.sync_engine, mode="slow", sample_rate=1.0, slow_ms=0.0)
+    slow_queries.clear()
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+        await conn.execute(text("SELECT 1"))
+        info = (await conn.get_raw_connection()).info
+    await engine.dispose()
+
+    assert "query_start_time" not in info
+    assert [q["statement"] for q in slow_queries] == ["SELECT 1"]
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from app.db import replicas
+from app.db.replicas import ReadYourWrites, ReplicaSet
+
+
+def make_request(authorization=None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_replica_set_round_robin_skips_unavailable(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'first.db'}"),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'broken.db'}"),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'third.db'}"),
+    ]
+    replica_set = ReplicaSet(engines, retry_interval=60, connect_timeout=1)
+
+    used = []
+    for _ in range(4):
+        session = await replica_set.open_session()
+        async with session:
+            await session.execute(text("SELECT 1"))
+            used.append(engines.index(session.bind))
+    for engine in engines:
+        await engine.dispose()
+
+    assert used == [0, 2, 2, 0]
+    assert [replica["down"] for replica in replica_set.stats()] == [False, True, False]
+    assert await ReplicaSet([], retry_interval=60, connect_timeout=1).open_session() is None
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_write(monkeypatch, in_memory_redis):
+    monkeypatch.setattr(replicas, "redis_client", in_memory_redis)
+    writer = make_request("Bearer writer")
+
+    await ReadYourWrites(window=5).mark(writer)
+    # Інший воркер бачить позначку через Redis
+    other_worker = ReadYourWrites(window=5)
+    assert await other_worker.is_sticky(make_request("Bearer writer"))
+    assert not await other_worker.is_sticky(make_request("Bearer reader"))
+    assert not await other_worker.is_sticky(make_request())
+
+
+@pytest.mark.asyncio
+async def test_counts_from_replica_are_not_cached(tmp_path, monkeypatch, in_memory_redis):
+    from sqlalchemy import select
+    from app.core.config import cache_settings
+    from app.db.database import Base
+    from app.db.models.user import User
+    from app.services import counter
+    from app.services.counter import CounterService
+
+    monkeypatch.setattr(counter, "redis_client", in_memory_redis)
+    monkeypatch.setattr(cache_settings, "CACHE_ENABLED", True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    replica_set = ReplicaSet([engine], retry_interval=60, connect_timeout=1)
+
+    session = await replica_set.open_session()
+    async with session:
+        assert await CounterService(session).total("count:users", select(User)) == 0
+    assert "count:users" not in in_memory_redis.data
+
+    async with replica_set._sessionmakers[0]() as primary_like:
+        await CounterService(primary_like).total("count:users", select(User))
+    await engine.dispose()
+    assert in_memory_redis.data["count:users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hanging_replica_is_marked_down_after_timeout(monkeypatch, tmp_path):
+    import asyncio
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'hanging.db'}")
+    replica_set = ReplicaSet([engine], retry_interval=60, connect_timeout=0.05)
+
+    async def hang(self, *args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(AsyncSession, "connection", hang)
+    assert await asyncio.wait_for(replica_set.open_session(), 1) is None
+    assert replica_set.is_down(0)
+    await engine.dispose()
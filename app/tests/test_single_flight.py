@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    flight = SingleFlight(lock_ttl=1, poll_interval=0.01)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    results = await asyncio.gather(*(flight.do("company:1", loader) for _ in range(10)))
+    assert calls == 1
+    assert all(result == {"id": 1} for result in results)
+
+    await flight.do("company:1", loader)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_loader_error_reaches_every_waiter():
+    flight = SingleFlight(lock_ttl=1, poll_interval=0.01)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=404, detail="error.company.notFound")
+
+    results = await asyncio.gather(
+        *(flight.do("company:404", loader) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, HTTPException) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiter_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight(lock_ttl=1, poll_interval=0.01)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(flight.do("user:1", loader))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("user:1", loader))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await waiter == 2
+    assert leader.cancelled()
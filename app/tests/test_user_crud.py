@@ -1,3 +1,4 @@
+import json
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
@@ -8,7 +9,7 @@ from sqlalchemy import text
 from passlib.context import CryptContext
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_read_db
 from app.db.models.user import User
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -45,6 +46,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -243,3 +245,61 @@ async def test_remove_user(client, db_session):
 
     response_get = await client.get(f"/users/{test_user.id}")
     assert response_get.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_read_users_with_cursor(client, db_session):
+    users = [
+        User(
+            name=f"Cursor User {i}",
+            email=f"cursor{i}@example.com",
+            age=20 + i,
+            hashed_password="hashed",
+            is_active=True,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+
+    response = await client.get("/users/?limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["name"] for user in data["users"]] == [
+        "Cursor User 0",
+        "Cursor User 1",
+    ]
+    assert data["next_cursor"] is not None
+
+    names = [user["name"] for user in data["users"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        response = await client.get("/users/", params={"limit": 2, "cursor": cursor})
+        assert response.status_code == 200
+        data = response.json()
+        names.extend(user["name"] for user in data["users"])
+        cursor = data["next_cursor"]
+
+    assert names == [f"Cursor User {i}" for i in range(5)]
+
+    response = await client.get("/users/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_stream_users(client, db_session):
+    db_session.add_all(
+        [
+            User(name=f"Streamed {i}", email=f"stream{i}@example.com", age=30)
+            for i in range(3)
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get("/users/stream")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["email"] for row in rows] == [
+        f"stream{i}@example.com" for i in range(3)
+    ]
+    assert all(row["friends"] == [] for row in rows)
@@ -2,7 +2,7 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from app.main import app
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_read_db
 from app.db.models.user import User
 from app.services.auth_service import AuthService
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -45,6 +45,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
         yield ac
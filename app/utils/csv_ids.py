@@ -0,0 +1,50 @@
+import codecs
+import csv
+from typing import AsyncIterator
+from fastapi import HTTPException
+
+
+async def read_csv_ids(chunks: AsyncIterator[bytes], max_items: int) -> list[int]:
+    # Розбираємо тіло запиту по мірі надходження, не тримаючи весь файл у пам'яті
+    ids: list[int] = []
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    first_row = True
+
+    def consume(line: str) -> None:
+        nonlocal first_row
+        row = next(csv.reader([line]), [])
+        value = row[0].strip() if row else ""
+        is_header, first_row = first_row, False
+        if not value:
+            return
+        try:
+            ids.append(int(value))
+        except ValueError:
+            # Дозволяємо рядок заголовка на кшталт "user_id"
+            if is_header:
+                return
+            raise HTTPException(status_code=400, detail="error.bulk.invalidCsv")
+        if len(ids) > max_items:
+            raise HTTPException(status_code=400, detail="error.bulk.tooManyItems")
+
+    async for chunk in chunks:
+        try:
+            buffer += decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="error.bulk.invalidCsv")
+        *lines, buffer = buffer.splitlines(keepends=True) or [""]
+        if buffer.endswith(("\n", "\r")):
+            lines.append(buffer)
+            buffer = ""
+        for line in lines:
+            consume(line)
+    try:
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="error.bulk.invalidCsv")
+    if buffer:
+        consume(buffer)
+    if not ids:
+        raise HTTPException(status_code=400, detail="error.bulk.empty")
+    return ids
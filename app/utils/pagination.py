@@ -0,0 +1,65 @@
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="error.pagination.invalidCursor")
+
+
+def _check_limit(limit: Optional[int]) -> None:
+    # Сторінка без рядків не має останнього id для курсора
+    if limit is not None and limit <= 0:
+        raise ValueError(f"Page limit must be positive, got {limit}")
+
+
+def paginate(
+    query: Select,
+    id_column: ColumnElement,
+    skip: int = 0,
+    limit: Optional[int] = 10,
+    cursor: Optional[str] = None,
+) -> Select:
+    # Вибираємо на один рядок більше, щоб знати, чи є наступна сторінка;
+    # limit=None — усі рядки після курсора
+    _check_limit(limit)
+    query = query.order_by(id_column)
+    if cursor is not None:
+        query = query.filter(id_column > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    if limit is None:
+        return query
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: Optional[int]) -> tuple[list, Optional[str]]:
+    _check_limit(limit)
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
+
+
+def set_cursor_headers(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    # Для ендпоінтів, що повертають голий список: курсор наступної сторінки в заголовках
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = next_cursor
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
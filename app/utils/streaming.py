@@ -0,0 +1,29 @@
+from typing import AsyncIterator, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import pagination_settings
+
+
+async def ndjson_rows(
+    db: AsyncSession,
+    query: Select,
+    schema: Type[BaseModel],
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[str]:
+    # Рядки читаються серверним курсором порціями по chunk_size, тому пам'ять
+    # не залежить від розміру вибірки
+    chunk_size = chunk_size or pagination_settings.STREAM_CHUNK_SIZE
+    result = await db.stream(query.execution_options(yield_per=chunk_size))
+    try:
+        async for partition in result.scalars().partitions():
+            yield "".join(
+                schema.model_validate(row).model_dump_json(by_alias=True) + "\n"
+                for row in partition
+            )
+    finally:
+        await result.close()
+        # Залежність get_db завершується ще до відправки тіла відповіді,
+        # тож з'єднання, відкрите для стріму, закриваємо тут
+        await db.close()
@@ -0,0 +1,9 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# INSERT ... ON CONFLICT є лише в діалектних конструкціях insert
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_for(db: AsyncSession, table):
+    return _INSERTS[db.get_bind().dialect.name](table)